@@ -1,7 +1,16 @@
+import json
+import re
 import sys
+import time
+from typing import TYPE_CHECKING
 
 from loguru import logger
 
+from bot.config.settings import config
+
+if TYPE_CHECKING:
+    from loguru import Message
+
 logger.remove()
 
 logger_str_format = (
@@ -11,5 +20,52 @@ logger_str_format = (
     "<c><b>{extra[session_name]: <7}</b></c> | "
     "<white><b>{message}</b></white>"
 )
-logger.add(sink=sys.stdout, format=logger_str_format, colorize=True)
-log = logger.bind(session_name="GLOBAL").opt(colors=True)
+markup_tag = re.compile(r"</?[a-z]+>")
+
+
+class RateLimitFilter:
+    """Passes at most LOG_RATE_LIMIT records per minute for each session and rate_limit key.
+
+    Only records bound with ``rate_limit=<key>`` are limited, e.g. ``logger.bind(rate_limit="taps")``.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: dict[tuple, tuple[float, int]] = {}
+
+    def __call__(self, record: dict) -> bool:
+        if not config.LOG_RATE_LIMIT or (key := record["extra"].get("rate_limit")) is None:
+            return True
+        bucket = (record["extra"].get("session_name"), key)
+        now = time.monotonic()
+        started, count = self._buckets.get(bucket, (now, 0))
+        if now - started >= 60:
+            started, count = now, 0
+        self._buckets[bucket] = (started, count + 1)
+        return count < config.LOG_RATE_LIMIT
+
+
+def json_sink(message: "Message") -> None:
+    record = message.record
+    row = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "session": record["extra"].get("session_name"),
+        "line": record["line"],
+        "message": markup_tag.sub("", record["message"]),
+    }
+    sys.stdout.write(json.dumps(row, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+if config.LOG_JSON:
+    logger.add(sink=json_sink, format="{message}", filter=RateLimitFilter(), enqueue=config.LOG_ENQUEUE)
+    log = logger.bind(session_name="GLOBAL")
+else:
+    logger.add(
+        sink=sys.stdout,
+        format=logger_str_format,
+        colorize=True,
+        filter=RateLimitFilter(),
+        enqueue=config.LOG_ENQUEUE,
+    )
+    log = logger.bind(session_name="GLOBAL").opt(colors=True)
@@ -19,6 +19,7 @@ class Strategy(str, Enum):
     protective = "protective"
     aggressive = "aggressive"
     random = "random"
+    adaptive = "adaptive"
 
 
 class League(str, Enum):
@@ -29,6 +30,16 @@ class League(str, Enum):
     diamond = "diamond"
 
 
+class LaunchMode(str, Enum):
+    delayed = "delayed"
+    ramp = "ramp"
+
+
+class SessionStorage(str, Enum):
+    files = "files"
+    database = "database"
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_ignore_empty=True, extra="allow")
 
@@ -36,26 +47,70 @@ class Settings(BaseSettings):
     API_HASH: str
 
     LOGIN_TIMEOUT: int = 3600
+    TG_CALL_INTERVAL: float = Field(
+        default=0, description="Min pause between Telegram calls of all sessions, 0 to pace only per proxy and session"
+    )
+    TG_PROXY_CALL_INTERVAL: float = Field(default=3, description="Min pause between Telegram calls through one proxy")
+    TG_ACCOUNT_CALL_INTERVAL: float = Field(default=5, description="Min pause between Telegram calls of one session")
+    TG_FLOOD_GROUP_THRESHOLD: int = Field(
+        default=2, description="Sessions flooded within a minute behind one proxy that pause the whole proxy"
+    )
+    SESSION_STORAGE: SessionStorage = Field(
+        default=SessionStorage.files, description="Keep sessions as sessions/*.session files or in sessions.sqlite3"
+    )
+    LOG_ENQUEUE: bool = Field(default=False, description="Write logs from a background thread")
+    LOG_JSON: bool = Field(default=False, description="Write logs as JSON lines without colours")
+    JOURNAL_ENABLED: bool = Field(default=False, description="Record bot actions to journal.sqlite3")
+    JOURNAL_BATCH_SIZE: int = 500
+    JOURNAL_FLUSH_INTERVAL: int = 30
+    LEDGER_ENABLED: bool = Field(default=True, description="Skip daily stages already done today (ledger.sqlite3)")
+    DAILY_RESET_HOUR: int = Field(default=0, description="UTC hour when daily rewards, quests and funds reset")
+    METRICS_INTERVAL: int = Field(default=0, description="Write stage timings to metrics.json every N seconds, 0 - off")
+    LOOP_LAG_INTERVAL: float = Field(default=0.5, description="Event loop lag probe interval, 0 - off")
+    LOOP_SLOW_CALLBACK: float = Field(default=0.25, description="Log the stack when the loop is blocked longer")
+    PROFILE_SECONDS: int = Field(default=60, description="Length of the profiling window started by SIGUSR1")
+    LOG_RATE_LIMIT: int = Field(default=0, description="Max chatty records (taps) per session a minute, 0 - all")
 
     TAPS_ENABLED: bool = True
     TAPS_PER_SECOND: list[int] = [20, 30]
+    TAP_MAX_SECONDS_PER_REQUEST: int = 20
     AUTO_UPGRADE_HERO: bool = True
     PVP_ENABLED: bool = False
     PVP_LEAGUE: League = League.bronze
     PVP_STRATEGY: Strategy = Strategy.random
     PVP_COUNT: int = 5
+    PVP_STATS_WINDOW: int = 500
+    PVP_LOG_MAX_RECORDS: int = 50_000
+    PVP_EXPLORE_RATE: float = 0.1
 
     SLEEP_BETWEEN_START: list[int] = [10, 20]
     SESSION_AC_DELAY: int = 10
+    LAUNCH_MODE: LaunchMode = LaunchMode.delayed
+    MAX_ACTIVE_CYCLES: int = Field(default=0, description="Max sessions in the middle of a cycle, 0 - no limit")
+    RAMP_DELAY: list[int] = [1, 60]
+    RAMP_MAX_ERROR_RATE: float = 0.2
+    RAMP_MAX_LATENCY: float = 5
     ERRORS_BEFORE_STOP: int = 5
     USE_PROXY_FROM_FILE: bool = False
     ADD_LOCAL_MACHINE_AS_IP: bool = False
+    PROXY_CHECK_URL: str = "https://httpbin.org/ip"
+    PROXY_CHECK_INTERVAL: int = 600
+    PROXY_CHECK_CONCURRENCY: int = 50
+    PROXY_MAX_ERROR_RATE: float = 0.5
+    PROXY_MAX_LATENCY: float = 10
 
     RANDOM_SLEEP_TIME: int = 8
+    CYCLE_PAUSE_BUDGET: int = Field(
+        default=0, description="Seconds of pauses between actions per cycle, 0 - fixed RANDOM_SLEEP_TIME pauses"
+    )
+    PAUSE_SIGMA: float = Field(default=0.5, description="Spread of the lognormal pause distribution")
+    PAUSE_MIN: float = Field(default=1, description="Shortest pause between actions with CYCLE_PAUSE_BUDGET, seconds")
     SKILL_WEIGHT: float = 0
     MAX_SKILL_UPGRADE_COSTS: int = 5e9
 
     MONEY_TO_SAVE: int = 1_000_000
+    BALANCE_SYNC_MAX_AGE: int = Field(default=900, description="Sync the balance when the local projection is older")
+    BALANCE_SYNC_TOLERANCE: float = Field(default=0.01, description="Relative balance drift that forces a sync")
 
     AUTO_UPGRADE_MINING: bool = True
     MAX_MINING_UPGRADE_LEVEL: int = 30
@@ -72,11 +127,23 @@ class Settings(BaseSettings):
     SKIP_TO_UPGRADE_SKILLS: list = Field([], description='Skip upgrade skills. For example: ["Уборщик", "Рекрутер,HR"]')
     SLEEP_AFTER_UPGRADE_NUM_SKILLS: list[int] = [20, 30]
     NUM_SKILLS: int = 8
+    BULK_CONCURRENCY: int = Field(default=3, description="Boxes, friends and quests claimed in parallel per session")
+    BULK_DELAY: list[float] = Field(default=[0.5, 2], description="Pause between starting bulk claims, seconds")
+    BULK_RETRIES: int = 2
     SKIP_TG_SUBSCRIPTION: bool = True
 
     BOT_SLEEP_TIME: list[int] = [1400, 2000]
+    WAKE_SCHEDULER_ENABLED: bool = Field(
+        default=True,
+        description="Wake the session when energy is full or an upgrade finishes, BOT_SLEEP_TIME is the upper bound",
+    )
+    MIN_SLEEP_TIME: int = 300
+    WAKE_JITTER: list[int] = [30, 120]
     REF_ID: str = "hero1092379081"
     base_url: str = "https://api2.xempire.io/"
+    auth_url: str = "https://api.xempire.io/"
+    HELPER_URL: str = "https://raw.githubusercontent.com/paveL1boyko/musk_daily/main/daily.json"
+    HELPER_CACHE_TTL: int = 2 * 60 * 60
     bot_name: str = "empirebot"
 
 
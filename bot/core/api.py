@@ -1,26 +1,34 @@
-import asyncio
 import json
-import random
-from datetime import datetime
-from typing import NamedTuple
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, NamedTuple
 from urllib.parse import parse_qs
 
 import aiohttp
-from aiocache import Cache, cached
 from better_proxy import Proxy
 from pyrogram import Client, errors
 from pyrogram.errors import FloodWait, RPCError, UserAlreadyParticipant
 from pyrogram.raw.functions import account
 from pyrogram.raw.functions.messages import RequestAppWebView
 from pyrogram.raw.types import InputBotAppShortName, InputNotifyPeer, InputPeerNotifySettings
-from pytz import UTC
 
 from bot.config.logger import log
 from bot.config.settings import config
 from bot.helper.utils import error_handler, handle_request
 
+from . import clock
+from .concurrency import startup_ramp, telegram_coordinator
 from .errors import TapsError
+from .journal import journal
+from .memory import live_bots
+from .metrics import cycle_metrics
 from .models import FundHelper, Profile, PvpData, UserDataAfter
+from .pacing import CyclePacer
+from .proxy_pool import proxy_pool
+from .reference_cache import reference_cache
+from .state import HeroState
 from .utils import num_prettier
 
 
@@ -34,13 +42,20 @@ class CryptoBotApi:
         self.session_name = tg_client.name
         self.tg_client = tg_client
         self.user_id = None
-        self.api_url = "https://api2.xempire.io"
+        self.api_url = config.base_url.rstrip("/")
+        self.auth_url = config.auth_url.rstrip("/")
         self.need_quiz = False
         self.need_rebus = False
         self.rebus_key = ""
         self.errors = 0
+        self.proxy = None
+        self.hero_state = HeroState()
+        self.pacer = CyclePacer()
+        self.current_stage: str | None = None
+        self._stage_requests = 0
         self.logger = log.bind(session_name=self.session_name)
         self._peer = None
+        live_bots.add(self)
 
     async def get_tg_web_data(self, proxy: str | None) -> TgWebData:
         if proxy:
@@ -58,27 +73,27 @@ class CryptoBotApi:
         self.tg_client.proxy = proxy_dict
 
         try:
+            await telegram_coordinator.wait_ready(self.session_name, self.proxy)
             async with self.tg_client:
                 if not self._peer:
                     try:
-                        self._peer = await self.tg_client.resolve_peer(config.bot_name)
+                        self._peer = await self.tg_call(self.tg_client.resolve_peer, config.bot_name)
                     except FloodWait as error:
                         self.logger.warning(f"FloodWait error: {error} | Retry in {error.value} seconds")
-                        await asyncio.sleep(delay=error.value)
+                        await telegram_coordinator.wait_ready(self.session_name, self.proxy)
                         # update in session db peer ids to fix this errors˚
-                        async for dialog in self.tg_client.get_dialogs():
-                            if dialog.chat and dialog.chat.username and dialog.chat.username == config.bot_name:
-                                break
-                        self._peer = await self.tg_client.resolve_peer(config.bot_name)
+                        await self.tg_call(self._load_bot_dialog)
+                        self._peer = await self.tg_call(self.tg_client.resolve_peer, config.bot_name)
 
-                web_view = await self.tg_client.invoke(
+                web_view = await self.tg_call(
+                    self.tg_client.invoke,
                     RequestAppWebView(
                         peer=self._peer,
                         app=InputBotAppShortName(bot_id=self._peer, short_name="game"),
                         platform="android",
                         write_allowed=True,
                         start_param=config.REF_ID,
-                    )
+                    ),
                 )
                 tg_web_data = parse_qs(web_view.url.split("#")[1]).get("tgWebAppData")[0]
                 query_params = parse_qs(tg_web_data)
@@ -99,50 +114,74 @@ class CryptoBotApi:
         except RuntimeError as error:
             raise error from error
         except FloodWait as error:
+            # the coordinator holds this session's next Telegram call until the wait is over
             log.warning(f"{self.session_name} | FloodWait error: {error} | Retry in {error.value} seconds")
-            await asyncio.sleep(delay=error.value)
             raise
         except Exception as error:
             log.error(f"{self.session_name} | Authorization error: {error}")
-            await asyncio.sleep(delay=3)
+            await clock.sleep(3)
             raise
 
+    async def _load_bot_dialog(self) -> None:
+        async for dialog in self.tg_client.get_dialogs():
+            if dialog.chat and dialog.chat.username and dialog.chat.username == config.bot_name:
+                break
+
     async def join_and_archive_channel(self, channel_name: str) -> None:
         try:
+            await telegram_coordinator.wait_ready(self.session_name, self.proxy)
             async with self.tg_client:
                 try:
-                    chat = await self.tg_client.join_chat(channel_name)
+                    chat = await self.tg_call(self.tg_client.join_chat, channel_name)
                     self.logger.info(f"Successfully joined to  <g>{chat.title}</g>")
                 except UserAlreadyParticipant:
                     self.logger.info(f"Chat <y>{channel_name}</y> already joined")
-                    chat = await self.tg_client.get_chat(channel_name)
+                    chat = await self.tg_call(self.tg_client.get_chat, channel_name)
                 except RPCError:
                     self.logger.error(f"Channel <y>{channel_name}</y> not found")
                     raise
 
                 await self.sleeper()
-                peer = await self.tg_client.resolve_peer(chat.id)
+                peer = await self.tg_call(self.tg_client.resolve_peer, chat.id)
 
-                await self.tg_client.invoke(
+                await self.tg_call(
+                    self.tg_client.invoke,
                     account.UpdateNotifySettings(
                         peer=InputNotifyPeer(peer=peer), settings=InputPeerNotifySettings(mute_until=2147483647)
-                    )
+                    ),
                 )
                 self.logger.info(f"Successfully muted chat <g>{chat.title}</g> for channel <y>{channel_name}</y>")
                 await self.sleeper()
-                await self.tg_client.archive_chats(chat_ids=[chat.id])
+                await self.tg_call(self.tg_client.archive_chats, chat_ids=[chat.id])
                 self.logger.info(f"Channel <g>{chat.title}</g> successfully archived for channel <y>{channel_name}</y>")
 
         except errors.FloodWait as e:
             self.logger.error(f"Waiting {e.value} seconds before the next attempt.")
-            await asyncio.sleep(e.value)
             raise
 
-    async def sleeper(self, delay: int = config.RANDOM_SLEEP_TIME, additional_delay: int = 6) -> None:
-        await asyncio.sleep(random.random() * delay + additional_delay)
+    async def tg_call(self, method: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run a Telegram call through the fleet-wide coordinator."""
+        return await telegram_coordinator.call(self.session_name, self.proxy, method, *args, **kwargs)
+
+    async def sleeper(self, delay: int = config.RANDOM_SLEEP_TIME, additional_delay: int = 6, floor: float = 0) -> None:
+        await clock.sleep(self.pacer.delay(delay, additional_delay, floor))
+
+    @asynccontextmanager
+    async def stage(self, name: str) -> AsyncIterator[None]:
+        """Time a cycle stage, splitting active time from the waits of the stage's task, and count its requests."""
+        self.current_stage, self._stage_requests = name, 0
+        started = time.perf_counter()
+        try:
+            with clock.count_waits() as waits:
+                yield
+        finally:
+            elapsed = time.perf_counter() - started
+            slept = min(waits.seconds, elapsed)
+            cycle_metrics.record(name, elapsed - slept, slept, self._stage_requests)
+            self.current_stage = None
 
     @error_handler()
-    @handle_request("https://api.xempire.io/telegram/auth", full_url=True)
+    @handle_request("/telegram/auth", base="auth_url")
     async def login(self, *, response_json: dict, json_body: dict) -> bool:
         if response_json.get("success", False):
             self.logger.success("Login successful")
@@ -152,7 +191,7 @@ class CryptoBotApi:
     @error_handler()
     @handle_request("/hero/balance/sync", json_body={"data": {}})
     async def syn_hero_balance(self, *, response_json: dict) -> Profile:
-        self._update_money_balance(response_json)
+        self._update_money_balance(response_json, authoritative=True)
         self.logger.info(
             f"Level: <blue>{self.level}</blue> | "
             f"Balance: <y>{num_prettier(self.balance)}</y> | "
@@ -162,12 +201,12 @@ class CryptoBotApi:
         return Profile(**response_json["data"])
 
     @error_handler()
-    @handle_request("https://api.xempire.io/user/data/all", full_url=True, json_body={"data": {}})
+    @handle_request("/user/data/all", base="auth_url", json_body={"data": {}})
     async def get_profile_full(self, *, response_json: dict) -> dict:
         return response_json["data"]
 
     @error_handler()
-    @handle_request("https://api.xempire.io/user/data/after", full_url=True, json_body={"data": {"lang": "en"}})
+    @handle_request("/user/data/after", base="auth_url", json_body={"data": {"lang": "en"}})
     async def user_data_after(self, *, response_json: dict) -> UserDataAfter:
         return UserDataAfter(**response_json["data"])
 
@@ -175,6 +214,7 @@ class CryptoBotApi:
     @handle_request("/hero/bonus/offline/claim")
     async def get_offline_bonus(self, *, response_json: dict) -> None:
         self._update_money_balance(response_json)
+        journal.write(self.session_name, "offline_bonus", money=self.user_profile.offline_bonus)
         self.logger.success(f"Offline bonus claimed: <y>+{num_prettier(self.user_profile.offline_bonus)}</y>")
 
     @error_handler()
@@ -184,9 +224,8 @@ class CryptoBotApi:
 
     @error_handler()
     @handle_request("/quests/claim")
-    async def quest_reward_claim(self, *, response_json: dict, json_body: dict) -> bool:
-        self._update_money_balance(response_json)
-        return True
+    async def quest_reward_claim(self, *, response_json: dict, json_body: dict) -> dict:
+        return response_json
 
     @error_handler()
     @handle_request("/quests/daily/progress/claim")
@@ -200,14 +239,16 @@ class CryptoBotApi:
 
     @error_handler()
     @handle_request("/quests/check")
-    async def quest_check(self, *, response_json: dict, json_body: dict) -> bool:
-        await self.sleeper()
-        await self.quest_reward_claim(json_body=json_body)
+    async def quest_check(self, *, response_json: dict, json_body: dict, pause: bool = True) -> dict:
+        # run_bulk paces its items with BULK_DELAY, a pause here would overlap with it
+        if pause:
+            await self.sleeper()
+        return await self.quest_reward_claim(json_body=json_body)
 
     @error_handler()
     @handle_request("/friends/claim")
-    async def friend_reward(self, *, response_json: dict, json_body: dict) -> None:
-        self._update_money_balance(response_json)
+    async def friend_reward(self, *, response_json: dict, json_body: dict) -> dict:
+        return response_json
 
     @error_handler()
     @handle_request("/hero/tap/action")
@@ -233,17 +274,18 @@ class CryptoBotApi:
     async def avatar_generated_all(self, *, response_json: dict) -> dict:
         return response_json
 
-    @cached(ttl=2 * 60 * 60, cache=Cache.MEMORY)
     @error_handler()
-    @handle_request(
-        "https://raw.githubusercontent.com/paveL1boyko/musk_daily/main/daily.json",
-        method="GET",
-        full_url=True,
-    )
-    async def get_helper(self, *, response_json: str) -> FundHelper | dict:
-        response_json = json.loads(response_json)
+    async def get_helper(self) -> FundHelper:
+        response_json = json.loads(
+            await reference_cache.fetch(
+                self.http_client,
+                config.HELPER_URL,
+                max_age=config.HELPER_CACHE_TTL,
+                observe=partial(self.observe_request, config.HELPER_URL),
+            )
+        )
         return FundHelper(
-            funds=response_json.get(str(datetime.now(UTC).date()), {}).get("funds", set()),
+            funds=response_json.get(str(clock.now().date()), {}).get("funds", set()),
             **response_json,
         )
 
@@ -304,6 +346,9 @@ class CryptoBotApi:
         for fnd in data["funds"]:
             if fnd["fundKey"] == json_body["data"]["fund"]:
                 money = fnd["moneyProfit"]
+                journal.write(
+                    self.session_name, "invest", key=fnd["fundKey"], money=-json_body["data"]["money"], profit=money
+                )
                 money_str = (
                     f"Win: <y>+{num_prettier(money)}</y>" if money > 0 else f"Loss: <red>{num_prettier(money)}</red>"
                 )
@@ -315,17 +360,50 @@ class CryptoBotApi:
     async def skills_improve(self, *, response_json: dict, json_body: dict) -> None:
         self._update_money_balance(response_json)
 
-    async def check_proxy(self, proxy: Proxy) -> None:
+    async def check_proxy(self, proxy: str) -> None:
+        started = time.perf_counter()
         try:
-            response = await self.http_client.get(url="https://httpbin.org/ip", timeout=aiohttp.ClientTimeout(10))
-            ip = (await response.json()).get("origin")
+            response = await self.http_client.get(
+                url=config.PROXY_CHECK_URL, timeout=aiohttp.ClientTimeout(config.PROXY_MAX_LATENCY)
+            )
+            ip = (await response.json(content_type=None)).get("origin")
+            proxy_pool.report(proxy, time.perf_counter() - started, ok=True)
             self.logger.info(f"Proxy IP: {ip}")
         except Exception:
+            proxy_pool.report(proxy, time.perf_counter() - started, ok=False)
             self.logger.exception(f"Proxy: {proxy}")
 
-    def _update_money_balance(self, response_json: dict) -> dict:
+    def observe_request(self, endpoint: str, elapsed: float, ok: bool) -> None:
+        self._stage_requests += 1
+        startup_ramp.observe(elapsed, ok)
+        proxy_pool.report(self.proxy, elapsed, ok)
+
+    async def refresh_balance(self) -> Profile:
+        """Balance sync only when the local projection is stale or has drifted."""
+        if self.hero_state.needs_sync():
+            return await self.syn_hero_balance()
+        profile = self.hero_state.projected_profile()
+        self.balance = profile.money
+        self.logger.info(
+            f"Level: <blue>{self.level}</blue> | "
+            f"Balance: <y>~{num_prettier(self.balance)}</y> | "
+            f"Money per hour: <g>{num_prettier(self.mph)}</g>"
+        )
+        return profile
+
+    def _update_money_balance(self, response_json: dict, authoritative: bool = False) -> dict:
         response_json = response_json["data"]
+        self.hero_state.reconcile(response_json["hero"], authoritative=authoritative)
         self.balance = int(response_json["hero"]["money"])
         self.level = int(response_json["hero"]["level"])
         self.mph = int(response_json["hero"]["moneyPerHour"])
         return response_json
+
+    def _update_money_balance_once(self, responses: list[dict]) -> None:
+        """Apply the hero of a batch of concurrent claims once.
+
+        Claims only add money, so the richest hero is the one the server returned last; the others
+        would roll the balance back when they arrive out of order.
+        """
+        if responses:
+            self._update_money_balance(max(responses, key=lambda response: response["data"]["hero"]["money"]))
@@ -1,32 +1,37 @@
-import asyncio
 import math
 import random
-import time
+from collections import Counter
 from collections.abc import Generator
-from datetime import datetime
 from enum import Enum
 
 import aiohttp
-from aiohttp_proxy import ProxyConnector
-from aiohttp_socks import ProxyConnector as SocksProxyConnector
 from pyrogram import Client
-from pytz import UTC
 
 from bot.config.headers import headers
 from bot.config.logger import log
 from bot.config.settings import Strategy, config
 from bot.core.api_js_helpers.bet_counter import BetCounter
 
+from . import clock
 from .api import CryptoBotApi
+from .concurrency import cycle_limiter, run_bulk, telegram_coordinator
 from .errors import TapsError
+from .journal import journal
+from .ledger import ledger
 from .models import DbSkill, DbSkills, Profile, ProfileData, SessionData, SkillLevel
+from .proxy_pool import make_proxy_connector, proxy_pool
+from .pvp_stats import fight_log
+from .quests import QuestIndex
+from .scheduler import next_wake_delay, wake_scheduler
+from .taps import TapPlanner
+from .upgrades import wants_hero_upgrade, wants_mining_upgrade
 from .utils import load_codes_from_files, num_prettier
 
 
 class CryptoBot(CryptoBotApi):
     def __init__(self, tg_client: Client, additional_data: dict) -> None:
         super().__init__(tg_client)
-        self.temporary_stop_taps_time = 0
+        self.temporary_stop_taps_time = -math.inf
         self.bet_calculator = BetCounter(self)
         self.pvp_count = config.PVP_COUNT
         self.authorized = False
@@ -37,73 +42,92 @@ class CryptoBot(CryptoBotApi):
         )
 
     async def claim_daily_reward(self) -> None:
+        if ledger.is_done(self.session_name, "daily_reward"):
+            return
         for day, status in self.data_after.daily_rewards.items():
             if status == "canTake":
                 await self.daily_reward(json_body={"data": str(day)})
+                journal.write(self.session_name, "daily_reward", key=str(day))
                 self.logger.success("Daily reward claimed")
-                return
+                break
+        ledger.mark_done(self.session_name, "daily_reward")
 
     async def perform_taps(self, profile: Profile) -> None:
         self.logger.info("Taps started")
+        planner = TapPlanner(profile)
         energy = profile.energy
-        while True:
-            taps_per_second = random.randint(*config.TAPS_PER_SECOND)
-            seconds = random.randint(5, 8)
-            earned_money = profile.money_per_tap * taps_per_second * seconds
-            energy_spent = math.ceil(earned_money / 2)
-            energy -= energy_spent
-            if energy < 0:
-                self.logger.info("Taps stopped (not enough energy)")
-                break
-            await self.sleeper(additional_delay=seconds)
+        while batch := planner.next_batch(energy):
+            await self.sleeper(delay=2, additional_delay=batch.seconds, floor=batch.seconds)
             try:
                 json_data = {
                     "data": {
-                        "data": {"task": {"amount": earned_money, "currentEnergy": energy}},
-                        "seconds": seconds,
+                        "data": {"task": {"amount": batch.amount, "currentEnergy": batch.energy}},
+                        "seconds": batch.seconds,
                     }
                 }
                 energy = await self.api_perform_taps(json_body=json_data)
-                await self.sleeper(additional_delay=8)
-                self.logger.success(
-                    f"Earned money: <y>+{num_prettier(earned_money)}</y> | Energy left: <blue>{num_prettier(energy)}</blue>"
+                journal.write(self.session_name, "taps", money=batch.amount, seconds=batch.seconds)
+                self.logger.bind(rate_limit="taps").success(
+                    f"Earned money: <y>+{num_prettier(batch.amount)}</y> | Energy left: <blue>{num_prettier(energy)}</blue>"
                 )
             except TapsError as e:
                 self.logger.warning(f"Taps stopped (<red>{e.message}</red>)")
-                self.temporary_stop_taps_time = time.monotonic() + 60 * 60 * 3
-                break
+                self.temporary_stop_taps_time = clock.monotonic() + 60 * 60 * 3
+                return
+        self.logger.info("Taps stopped (not enough energy)")
 
     async def execute_and_claim_daily_quest(self) -> None:
-        helper_data = await self.get_helper()
-        helper_data.youtube.update(load_codes_from_files())
+        if ledger.is_done(self.session_name, "daily_quests"):
+            return
         all_daily_quests = await self.all_daily_quests()
+        # the day is done only once its quests are published and every one of them is rewarded
+        unrewarded = 0
         for key, value in all_daily_quests.items():
             desc = value.get("description") or value.get("title") or value.get("key") or "Unknown Quest"
             try:
                 if value["type"] == "youtube":
                     if not value["isRewarded"]:
-                        code = helper_data.youtube.get(desc)
+                        unrewarded += 1
+                        code = self.quest_index.code_for(desc)
                         if code is not None:
                             await self.daily_quest_reward(json_body={"data": {"quest": key, "code": str(code)}})
+                            journal.write(self.session_name, "daily_quest", key=key)
                             self.logger.info(f"Quest <g>{desc}</g> claimed")
+                            unrewarded -= 1
                         else:
                             self.logger.warning(f"No code found for quest: \n<r>{desc}</r>")
                     else:
                         self.logger.info(f"Quest <g>{desc}</g> already rewarded")
                 elif not value["isRewarded"]:
+                    unrewarded += 1
                     self.logger.info(f"Quest not executed: \n<r>{desc}</r>")
                 else:
                     self.logger.info(f"Quest <g>{desc}</g> already rewarded")
             except Exception as e:
+                unrewarded += 1
                 self.logger.error(f"Error processing quest {desc}: {e}")
+        if all_daily_quests and not unrewarded:
+            ledger.mark_done(self.session_name, "daily_quests")
 
     async def claim_all_executed_quest(self) -> None:
-        for i in self.data_after.quests:
-            if not i["isRewarded"]:
-                if config.SKIP_IMPROVE_DISCIPLINE_BUG and i["key"] == "improve_discipline":
-                    continue
-                await self.quest_reward_claim(json_body={"data": [i["key"], None]})
-                self.logger.info(f'Quest <g>{i["key"]}</g> claimed ')
+        keys = [
+            quest["key"]
+            for quest in self.data_after.quests
+            if not quest["isRewarded"]
+            and not (config.SKIP_IMPROVE_DISCIPLINE_BUG and quest["key"] == "improve_discipline")
+        ]
+        if not keys:
+            return
+        result = await run_bulk(
+            keys, lambda key: self.quest_reward_claim(json_body={"data": [key, None]}), logger=self.logger
+        )
+        self._update_money_balance_once([response for _, response in result.succeeded])
+        for key, _ in result.succeeded:
+            journal.write(self.session_name, "quest", key=key)
+        self.logger.info(
+            f"Quests claimed: <g>{len(result.succeeded)}/{len(keys)}</g> "
+            f"<g>{', '.join(key for key, _ in result.succeeded)}</g>"
+        )
 
     def random_pvp_count(self) -> int:
         return random.randint(config.PVP_COUNT, config.PVP_COUNT * 2)
@@ -130,8 +154,10 @@ class CryptoBot(CryptoBotApi):
                 self.logger.info(f"PvP negotiations stopped (<red>not enough money</red>). Pvp profit: {money_str}")
                 break
 
-            if strategy == "random":
+            if strategy == Strategy.random:
                 current_strategy = random.choice(self.strategies)
+            elif strategy == Strategy.adaptive:
+                current_strategy = fight_log.best_strategy(league["key"], self.strategies)
             self.logger.info("Searching opponent...")
             current_strategy = current_strategy.value if isinstance(current_strategy, Enum) else current_strategy
             json_data = {"data": {"league": league["key"], "strategy": current_strategy}}
@@ -144,6 +170,22 @@ class CryptoBot(CryptoBotApi):
             opponent_strategy = (
                 fight.player2Strategy if fight.player1 == self.user_profile.user_id else fight.player1Strategy
             )
+            fight_log.record(
+                league=league["key"],
+                contract=fight.moneyContract,
+                strategy=current_strategy,
+                opponent_strategy=opponent_strategy,
+                won=fight.winner == self.user_profile.user_id,
+            )
+            journal.write(
+                self.session_name,
+                "pvp",
+                key=league["key"],
+                money=fight.moneyContract,
+                profit=fight.moneyProfit if fight.winner == self.user_profile.user_id else -fight.moneyContract,
+                strategy=current_strategy,
+                opponent_strategy=opponent_strategy,
+            )
             if fight.winner == self.user_profile.user_id:
                 money += fight.moneyProfit
                 log_part = f"You <g>WIN</g> (<y>+{num_prettier(fight.moneyProfit)})</y>"
@@ -168,14 +210,22 @@ class CryptoBot(CryptoBotApi):
         self.pvp_count = config.PVP_COUNT
 
     async def get_friend_reward(self) -> None:
-        for friend in [friend for friend in self.data_after.friends if friend["bonusToTake"] > 0]:
-            await self.friend_reward(json_body={"data": friend["id"]})
-            self.logger.info(
-                f"Friend <g>{friend['name']}</g> claimed money <y>{num_prettier(friend['bonusToTake'])}</y>"
-            )
-            await self.sleeper()
+        friends = [friend for friend in self.data_after.friends if friend["bonusToTake"] > 0]
+        if not friends:
+            return
+        result = await run_bulk(
+            friends, lambda friend: self.friend_reward(json_body={"data": friend["id"]}), logger=self.logger
+        )
+        self._update_money_balance_once([response for _, response in result.succeeded])
+        for friend, _ in result.succeeded:
+            journal.write(self.session_name, "friend", key=str(friend["id"]), money=friend["bonusToTake"])
+        money = sum(friend["bonusToTake"] for friend, _ in result.succeeded)
+        self.logger.info(
+            f"Friends claimed: <g>{len(result.succeeded)}/{len(friends)}</g> | Money: <y>+{num_prettier(money)}</y>"
+        )
 
     async def solve_quiz_and_rebus(self) -> None:
+        riddles = []
         for quest in self.dbs["dbQuests"]:
             quest_key = quest["key"]
             if quest["requiredLevel"] > self.user_profile.level:
@@ -187,28 +237,47 @@ class CryptoBot(CryptoBotApi):
                     if quest["checkType"] != "fakeCheck":
                         link = link if "/+" in link else link.split("/")[-1]
                         await self.join_and_archive_channel(link)
-                    await self.quest_check(json_body={"data": [quest_key]})
+                    self._update_money_balance(await self.quest_check(json_body={"data": [quest_key]}))
+                    journal.write(self.session_name, "quest", key=quest_key, money=quest["rewardMoney"])
+                    self.quest_index.mark_solved(quest_key)
                     self.logger.info(
                         f'Claimed <g>{quest["title"]}</g> Reward: <y>+{num_prettier(quest["rewardMoney"])}</y>quest'
                     )
             if any(i in quest_key for i in ("riddle", "rebus", "tg_story")) and not self._is_event_solved(quest_key):
-                await self.quest_check(json_body={"data": [quest_key, quest["checkData"]]})
-                self.logger.info(f"Was solved <g>{quest['title']}</g>")
+                riddles.append(quest)
+        if not riddles:
+            return
+        result = await run_bulk(
+            riddles,
+            lambda quest: self.quest_check(json_body={"data": [quest["key"], quest["checkData"]]}, pause=False),
+            logger=self.logger,
+        )
+        self._update_money_balance_once([response for _, response in result.succeeded])
+        for quest, _ in result.succeeded:
+            journal.write(self.session_name, "quest", key=quest["key"])
+            self.quest_index.mark_solved(quest["key"])
+            self.logger.info(f"Was solved <g>{quest['title']}</g>")
 
     def _is_event_solved(self, quest_key: str) -> bool:
-        return self.data_after.quests and any(i["key"] == quest_key for i in self.data_after.quests)
+        return self.quest_index.is_solved(quest_key)
 
     async def set_funds(self) -> None:
+        if ledger.is_done(self.session_name, "funds"):
+            return
         helper_data = await self.get_helper()
         if helper_data.funds:
             current_invest = await self.get_funds_info()
             already_funded = {i["fundKey"] for i in current_invest["funds"]}
+            funded = len(already_funded)
             for fund in list(helper_data.funds - already_funded)[: 3 - len(already_funded)]:
                 if self.balance > (amount := self.bet_calculator.calculate_bet()):
                     self.logger.info(f"Investing <y>{num_prettier(amount)}</y> to  fund <blue>{fund}</blue>")
                     await self.invest(json_body={"data": {"fund": fund, "money": amount}})
+                    funded += 1
                 else:
                     self.logger.info("Not enough money for invest")
+            if funded >= 3:
+                ledger.mark_done(self.session_name, "funds")
 
     async def starting_pvp(self) -> None:
         if self.dbs:
@@ -221,7 +290,10 @@ class CryptoBot(CryptoBotApi):
             if league_data is not None:
                 if self.level >= int(league_data["requiredLevel"]):
                     self.strategies = [strategy["key"] for strategy in self.dbs["dbNegotiationsStrategy"]]
-                    if Strategy.random == config.PVP_STRATEGY or config.PVP_STRATEGY in self.strategies:
+                    if (
+                        config.PVP_STRATEGY in (Strategy.random, Strategy.adaptive)
+                        or config.PVP_STRATEGY in self.strategies
+                    ):
                         await self._perform_pvp(
                             league=league_data,
                             strategy=config.PVP_STRATEGY.value,
@@ -248,23 +320,31 @@ class CryptoBot(CryptoBotApi):
             await self._upgrade_mining_skill(available_skill)
 
     async def get_box_rewards(self) -> None:
-        boxes = await self.get_box_list()
-        for key, box_count in boxes.items():
-            for _ in range(box_count):
-                res = await self.box_open(json_body={"data": key})
-                self.logger.info(f"Box <g>{key}</g> Was looted: <y>{res['loot']}</y>")
+        boxes = [key for key, box_count in (await self.get_box_list()).items() for _ in range(box_count)]
+        if not boxes:
+            return
+        result = await run_bulk(boxes, lambda key: self.box_open(json_body={"data": key}), logger=self.logger)
+        loot, other_loot = Counter(), []
+        for key, res in result.succeeded:
+            items = res.get("loot") if isinstance(res, dict) else res
+            journal.write(self.session_name, "box", key=key, loot=items)
+            # only loot listed as {"type", "value"} can be summed, anything else is logged as it came
+            if isinstance(items, list) and all(
+                isinstance(item, dict) and isinstance(item.get("value"), int | float) for item in items
+            ):
+                for item in items:
+                    loot[item.get("type", "loot")] += item["value"]
+            else:
+                other_loot.append(items)
+        summary = ", ".join(f"{kind} +{num_prettier(value)}" for kind, value in loot.items()) or "-"
+        if other_loot:
+            summary += f" | Other: {other_loot}"
+        self.logger.info(f"Boxes opened: <g>{len(result.succeeded)}/{len(boxes)}</g> | Loot: <y>{summary}</y>")
 
     async def _upgrade_mining_skill(self, available_skill: list[DbSkill]) -> None:
         counter = 0
         for skill in [skill for skill in available_skill if skill.category == "mining"]:
-            if (
-                skill.key in config.MINING_ENERGY_SKILLS
-                and skill.next_level <= config.MAX_MINING_ENERGY_RECOVERY_UPGRADE_LEVEL
-                or (
-                    skill.next_level <= config.MAX_MINING_UPGRADE_LEVEL
-                    or skill.skill_price <= config.MAX_MINING_UPGRADE_COSTS
-                )
-            ):
+            if wants_mining_upgrade(skill.key, skill.next_level, skill.skill_price):
                 if counter >= config.NUM_SKILLS:
                     counter = 0
                     await self.sleeper(additional_delay=random.randint(*config.SLEEP_AFTER_UPGRADE_NUM_SKILLS))
@@ -281,10 +361,8 @@ class CryptoBot(CryptoBotApi):
             key=lambda x: x.weight,
             reverse=True,
         ):
-            if skill.title in config.SKIP_TO_UPGRADE_SKILLS:
-                continue
             # if skill.weight >= config.SKILL_WEIGHT or skill.skill_price <= config.MAX_SKILL_UPGRADE_COSTS:
-            if skill.weight >= config.SKILL_WEIGHT:
+            if wants_hero_upgrade(skill.title, skill.weight):
                 if counter >= config.NUM_SKILLS:
                     counter = 0
                     await self.sleeper(additional_delay=random.randint(*config.SLEEP_AFTER_UPGRADE_NUM_SKILLS))
@@ -295,6 +373,14 @@ class CryptoBot(CryptoBotApi):
         if self._is_enough_money_for_upgrade(skill):
             try:
                 await self.skills_improve(json_body={"data": skill.key})
+                journal.write(
+                    self.session_name,
+                    "upgrade",
+                    key=skill.key,
+                    money=-skill.skill_price,
+                    profit=skill.skill_profit,
+                    level=skill.next_level,
+                )
                 self.logger.info(
                     f"Skill: <blue>{skill.title}</blue> upgraded to level: <c>{skill.next_level}</c> "
                     f"Profit: <y>{num_prettier(skill.skill_profit)}</y> "
@@ -324,7 +410,7 @@ class CryptoBot(CryptoBotApi):
 
     def _is_available_to_upgrade_skills(self, skill: DbSkill) -> bool:
         # check the current skill is still in the process of improvement
-        if skill.progress_time and skill.progress_time.timestamp() + 60 > datetime.now(UTC).timestamp():
+        if skill.progress_time and skill.progress_time.timestamp() + 60 > clock.timestamp():
             return False
         if skill.next_level > skill.maxLevel:
             return False
@@ -357,88 +443,124 @@ class CryptoBot(CryptoBotApi):
             return True
         return False
 
-    async def run(self, proxy: str | None) -> None:
-        proxy = proxy or self.additional_data.proxy
-        if proxy and "socks" in proxy:
-            proxy_conn = SocksProxyConnector.from_url(proxy)
-        elif proxy:
-            proxy_conn = ProxyConnector.from_url(proxy)
+    async def sleep_until_next_cycle(self, profile: Profile) -> None:
+        if config.WAKE_SCHEDULER_ENABLED:
+            taps_paused_for = max(self.temporary_stop_taps_time - clock.monotonic(), 0)
+            sleep_time = next_wake_delay(profile, self.data_after, taps_paused_for)
         else:
-            proxy_conn = None
-
-        async with aiohttp.ClientSession(
-            headers=headers,
-            connector=proxy_conn,
-            timeout=aiohttp.ClientTimeout(total=60),
-        ) as http_client:
-            self.http_client = http_client
-            if proxy:
-                await self.check_proxy(proxy=proxy)
-
-            while True:
-                if self.errors >= config.ERRORS_BEFORE_STOP:
-                    self.logger.error("Bot stopped (too many errors)")
-                    break
-                try:
-                    if await self.login_to_app(proxy):
-                        # if not self.settings_was_set:
-                        #     await self.sent_eng_settings()
-                        data = await self.get_profile_full()
-                        self.dbs = data["dbData"]
-                        self.data_after = await self.user_data_after()
+            sleep_time = random.randint(*config.BOT_SLEEP_TIME)
+        self.logger.info(f"Sleep minutes {sleep_time // 60} minutes")
+        await wake_scheduler.sleep(sleep_time)
+
+    async def run_cycle(self, proxy: str | None) -> Profile:
+        async with self.stage("login"):
+            if await self.login_to_app(proxy):
+                # if not self.settings_was_set:
+                #     await self.sent_eng_settings()
+                data = await self.get_profile_full()
+                self.dbs = data["dbData"]
+                self.data_after = await self.user_data_after()
+                helper_data = await self.get_helper()
+                self.quest_index = QuestIndex(
+                    self.data_after.quests, {**helper_data.youtube, **load_codes_from_files()}
+                )
 
-                        await self.purchase_list()
-                        await self.billing_balance()
-                        await self.avatar_generated_all()
+                await self.purchase_list()
+                await self.billing_balance()
+                await self.avatar_generated_all()
 
-                        self.user_profile: ProfileData = ProfileData(**data)
-                        if self.user_profile.offline_bonus > 0:
-                            await self.get_offline_bonus()
+                self.user_profile: ProfileData = ProfileData(**data)
+                self._update_money_balance({"data": data}, authoritative=True)
+                if self.user_profile.offline_bonus > 0:
+                    await self.get_offline_bonus()
 
-                    profile = await self.syn_hero_balance()
+        async with self.stage("sync"):
+            profile = await self.refresh_balance()
 
-                    await self.get_box_rewards()
+        async with self.stage("boxes"):
+            await self.get_box_rewards()
 
-                    config.MONEY_TO_SAVE = self.bet_calculator.max_bet()
-                    self.logger.info(f"Max bet for funds saved: <y>{num_prettier(config.MONEY_TO_SAVE)}</y>")
+        config.MONEY_TO_SAVE = self.bet_calculator.max_bet()
+        self.logger.info(f"Max bet for funds saved: <y>{num_prettier(config.MONEY_TO_SAVE)}</y>")
 
-                    await self.claim_daily_reward()
+        async with self.stage("daily"):
+            await self.claim_daily_reward()
 
-                    await self.execute_and_claim_daily_quest()
+        async with self.stage("quests"):
+            await self.execute_and_claim_daily_quest()
 
-                    await self.syn_hero_balance()
-                    if config.GET_FRIEND_REWARD:
-                        await self.get_friend_reward()
+        if config.GET_FRIEND_REWARD:
+            async with self.stage("friends"):
+                await self.get_friend_reward()
 
-                    if config.TAPS_ENABLED and profile.energy and time.monotonic() > self.temporary_stop_taps_time:
-                        await self.perform_taps(profile)
+        if config.TAPS_ENABLED and profile.energy and clock.monotonic() > self.temporary_stop_taps_time:
+            async with self.stage("taps"):
+                await self.perform_taps(profile)
 
-                    await self.set_funds()
-                    await self.solve_quiz_and_rebus()
+        async with self.stage("funds"):
+            await self.set_funds()
+        async with self.stage("quiz"):
+            await self.solve_quiz_and_rebus()
 
-                    await self.claim_all_executed_quest()
+        async with self.stage("claims"):
+            await self.claim_all_executed_quest()
 
-                    await self.upgrade_hero()
+        async with self.stage("upgrades"):
+            await self.upgrade_hero()
 
-                    # if config.PVP_ENABLED:
-                    #     await self.starting_pvp()
-                    await self.syn_hero_balance()
-                    sleep_time = random.randint(*config.BOT_SLEEP_TIME)
-                    self.logger.info(f"Sleep minutes {sleep_time // 60} minutes")
-                    await asyncio.sleep(sleep_time)
+        # if config.PVP_ENABLED:
+        #     async with self.stage("pvp"):
+        #         await self.starting_pvp()
+        async with self.stage("sync"):
+            return await self.refresh_balance()
 
-                except RuntimeError as error:
-                    raise error from error
-                except Exception as e:
-                    if "bot is out" in str(e):
-                        break
-                    self.errors += 1
-                    self.authorized = False
-                    self.logger.exception("Unknown error")
-                    await self.sleeper(additional_delay=self.errors * 8)
-                else:
-                    self.errors = 0
-                    self.authorized = False
+    async def run(self, proxy: str | None) -> None:
+        self.proxy = proxy or self.additional_data.proxy
+        while True:
+            async with aiohttp.ClientSession(
+                headers=headers,
+                connector=make_proxy_connector(self.proxy),
+                timeout=aiohttp.ClientTimeout(total=60),
+            ) as http_client:
+                self.http_client = http_client
+                if self.proxy:
+                    await self.check_proxy(proxy=self.proxy)
+                if not await self._run_cycles():
+                    break
+            self.proxy = proxy_pool.acquire(self.session_name)
+            self.authorized = False
+            self.logger.warning(f"Proxy degraded, switched to <y>{self.proxy}</y>")
+
+    async def _run_cycles(self) -> bool:
+        """Run cycles until the bot stops (False) or its pooled proxy degrades (True)."""
+        while True:
+            if self.errors >= config.ERRORS_BEFORE_STOP:
+                self.logger.error("Bot stopped (too many errors)")
+                return False
+            if proxy_pool.manages(self.proxy) and proxy_pool.should_switch(self.session_name):
+                return True
+            try:
+                # a session held back by a FloodWait must not keep a cycle slot from the others
+                await telegram_coordinator.wait_ready(self.session_name, self.proxy)
+                async with cycle_limiter:
+                    self.pacer.start_cycle()
+                    profile = await self.run_cycle(self.proxy)
+                    self.pacer.finish_cycle()
+                async with self.stage("wait"):
+                    await self.sleep_until_next_cycle(profile)
+
+            except RuntimeError as error:
+                raise error from error
+            except Exception as e:
+                if "bot is out" in str(e):
+                    return False
+                self.errors += 1
+                self.authorized = False
+                self.logger.exception("Unknown error")
+                await self.sleeper(additional_delay=self.errors * 8, floor=self.errors * 8)
+            else:
+                self.errors = 0
+                self.authorized = False
 
 
 async def run_bot(tg_client: Client, proxy: str | None, additional_data: dict) -> None:
@@ -0,0 +1,158 @@
+"""The clock the bot reads for sleeps, deadlines and game dates.
+
+Everything that decides *when* a session acts goes through this module: sleeper and cycle waits,
+the wake scheduler, tap pauses, balance projection, skill upgrade timers and reference data
+freshness. Process instrumentation (loop lag, stage timings, profilers, request latency) keeps
+using the real clock. ``use(FastForwardClock())`` lets tests and benchmarks run days of cycles in
+seconds.
+
+Deliberate waits are counted in real seconds for the stage timings: ``count_waits()`` sums what
+the current task spends in ``sleep()`` and ``wait()``, the waits of tasks it starts are their own.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any
+
+from pytz import UTC
+
+
+class Clock:
+    """Real time."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def time(self) -> float:
+        return time.time()
+
+    def now(self) -> datetime:
+        return datetime.now(UTC)
+
+    async def sleep(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+
+class FastForwardClock(Clock):
+    """Virtual time that jumps straight to the earliest timer once the event loop has nothing to run.
+
+    Starts at the current wall time. Tasks waiting on network I/O do not hold the clock back; pass
+    ``io_grace`` (real seconds) to give them a chance to finish before every jump.
+    """
+
+    def __init__(self, start: datetime | None = None, io_grace: float = 0) -> None:
+        self.start = start or datetime.now(UTC)
+        self.io_grace = io_grace
+        self.elapsed = 0.0
+        self._timers: list[tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._driver: asyncio.Task | None = None
+
+    def monotonic(self) -> float:
+        return self.elapsed
+
+    def time(self) -> float:
+        return self.start.timestamp() + self.elapsed
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.elapsed)
+
+    async def sleep(self, delay: float) -> None:
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._timers, (self.elapsed + delay, next(self._counter), future))
+        if self._driver is None or self._driver.done():
+            self._driver = asyncio.create_task(self._drive())
+        await future
+
+    async def _drive(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._timers:
+            await self._settle(loop)
+            wake_at, _, future = heapq.heappop(self._timers)
+            if future.done():
+                continue
+            self.elapsed = max(self.elapsed, wake_at)
+            future.set_result(None)
+
+    async def _settle(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Yield until no other callback is ready to run."""
+        if self.io_grace:
+            await asyncio.sleep(self.io_grace)
+        await asyncio.sleep(0)
+        # the default event loop exposes its ready queue, other loops get a fixed number of turns
+        if (ready := getattr(loop, "_ready", None)) is None:
+            for _ in range(100):
+                await asyncio.sleep(0)
+            return
+        while ready:
+            await asyncio.sleep(0)
+
+
+_clock = Clock()
+
+
+def use(clock: Clock) -> None:
+    global _clock
+    _clock = clock
+
+
+def current() -> Clock:
+    return _clock
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def timestamp() -> float:
+    return _clock.time()
+
+
+def now() -> datetime:
+    return _clock.now()
+
+
+class WaitAccount:
+    __slots__ = ("task", "seconds")
+
+    def __init__(self, task: asyncio.Task | None) -> None:
+        self.task = task
+        self.seconds = 0.0
+
+
+_wait_account: ContextVar[WaitAccount | None] = ContextVar("wait_account", default=None)
+
+
+@contextmanager
+def count_waits() -> Iterator[WaitAccount]:
+    account = WaitAccount(asyncio.current_task())
+    token = _wait_account.set(account)
+    try:
+        yield account
+    finally:
+        _wait_account.reset(token)
+
+
+async def wait(awaitable: Awaitable) -> Any:
+    """Await a deliberate wait that is not a plain sleep, such as a timer future, counting it like sleep()."""
+    account = _wait_account.get()
+    if account is None or account.task is not asyncio.current_task():
+        return await awaitable
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        account.seconds += time.perf_counter() - started
+
+
+async def sleep(delay: float) -> None:
+    await wait(_clock.sleep(delay))
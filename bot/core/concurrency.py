@@ -0,0 +1,190 @@
+import asyncio
+import random
+import statistics
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable, Iterable
+from types import TracebackType
+from typing import Any, NamedTuple
+
+from pyrogram.errors import FloodWait
+
+from bot.config.logger import log
+from bot.config.settings import config
+
+from . import clock
+from .metrics import cycle_metrics
+
+
+class CycleLimiter:
+    """Caps how many sessions run a cycle at the same time, MAX_ACTIVE_CYCLES=0 means no limit."""
+
+    def __init__(self, limit: int) -> None:
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def __aenter__(self) -> None:
+        if self._semaphore:
+            await self._semaphore.acquire()
+
+    async def __aexit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None
+    ) -> None:
+        if self._semaphore:
+            self._semaphore.release()
+
+
+class StartupRamp:
+    """Delay between session starts that grows on errors or slow responses and shrinks while healthy."""
+
+    window = 50
+    min_samples = 10
+
+    def __init__(self) -> None:
+        self.delay = float(config.SESSION_AC_DELAY)
+        self._latencies: deque[float] = deque(maxlen=self.window)
+        self._failures: deque[bool] = deque(maxlen=self.window)
+
+    def observe(self, elapsed: float, ok: bool) -> None:
+        self._latencies.append(elapsed)
+        self._failures.append(not ok)
+
+    def next_delay(self) -> float:
+        min_delay, max_delay = config.RAMP_DELAY
+        if len(self._failures) >= self.min_samples:
+            error_rate = sum(self._failures) / len(self._failures)
+            latency = statistics.quantiles(self._latencies, n=10)[-1]
+            if error_rate > config.RAMP_MAX_ERROR_RATE or latency > config.RAMP_MAX_LATENCY:
+                self.delay *= 2
+            else:
+                self.delay *= 0.75
+        self.delay = min(max(self.delay, min_delay), max_delay)
+        return self.delay + random.random() * min_delay
+
+
+class BulkResult(NamedTuple):
+    succeeded: list[tuple[Any, Any]]
+    failed: list[tuple[Any, Exception]]
+
+
+async def run_bulk(
+    items: Iterable[Any],
+    action: Callable[[Any], Awaitable[Any]],
+    logger=log,
+    concurrency: int | None = None,
+    retries: int | None = None,
+) -> BulkResult:
+    """Run ``action`` for independent items, BULK_CONCURRENCY at a time with starts BULK_DELAY apart.
+
+    A failed item is retried on its own up to BULK_RETRIES times; the others are not affected.
+    """
+    concurrency = concurrency or config.BULK_CONCURRENCY
+    retries = config.BULK_RETRIES if retries is None else retries
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    result = BulkResult([], [])
+
+    async def run_item(item: Any) -> None:
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    result.succeeded.append((item, await action(item)))
+                    return
+                except Exception as error:
+                    if attempt == retries:
+                        result.failed.append((item, error))
+                        return
+                    logger.warning(f"Retry <y>{attempt + 1}/{retries}</y> after error: {error}")
+                    await clock.sleep(random.uniform(*config.BULK_DELAY) * (attempt + 1))
+
+    tasks = []
+    try:
+        for index, item in enumerate(items):
+            if index:
+                await clock.sleep(random.uniform(*config.BULK_DELAY))
+            tasks.append(asyncio.create_task(run_item(item)))
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return result
+
+
+class TelegramCoordinator:
+    """Queues Telegram calls of all sessions and holds back the group of callers a FloodWait belongs to.
+
+    Every call takes the next free slot of three groups: the fleet (all sessions share one API_ID, only
+    paced when TG_CALL_INTERVAL is set), the proxy and the account. A FloodWait pushes the account past
+    the wait and doubles its call interval, which shrinks back to TG_ACCOUNT_CALL_INTERVAL while its
+    calls succeed. When TG_FLOOD_GROUP_THRESHOLD accounts behind one proxy are flooded within
+    ``flood_window`` seconds the whole proxy waits too. Sessions without a proxy have no proxy group.
+    """
+
+    flood_window = 60
+    max_interval = 30.0
+
+    def __init__(self) -> None:
+        self.flood_waits = 0
+        self._free_at: dict[tuple[str, str | None], float] = defaultdict(float)
+        self._floods: dict[str, deque[tuple[float, str]]] = defaultdict(deque)
+        self._intervals: dict[str, float] = {}
+
+    def account_interval(self, session: str) -> float:
+        return self._intervals.get(session, config.TG_ACCOUNT_CALL_INTERVAL)
+
+    def _groups(self, session: str, proxy: str | None) -> list[tuple[tuple[str, str | None], float]]:
+        groups = [(("fleet", None), config.TG_CALL_INTERVAL), (("account", session), self.account_interval(session))]
+        if proxy is not None:
+            groups.append((("proxy", proxy), config.TG_PROXY_CALL_INTERVAL))
+        return groups
+
+    async def wait_ready(self, session: str, proxy: str | None) -> None:
+        """Wait out a FloodWait of the account or its proxy without taking a slot, e.g. before connecting."""
+        ready_at = max(self._free_at[("proxy", proxy)] if proxy is not None else 0, self._free_at[("account", session)])
+        if (delay := ready_at - clock.monotonic()) > 0:
+            log.bind(session_name=session).info(f"Telegram calls paused for <y>{delay:.0f}</y> seconds")
+            await clock.sleep(delay)
+
+    async def call(self, session: str, proxy: str | None, method: Callable[..., Awaitable[Any]], *args, **kwargs):
+        now = clock.monotonic()
+        groups = self._groups(session, proxy)
+        start = max(now, *(self._free_at[key] for key, _ in groups))
+        for key, interval in groups:
+            self._free_at[key] = start + interval
+        if start > now:
+            await clock.sleep(start - now)
+        try:
+            result = await method(*args, **kwargs)
+        except FloodWait as error:
+            self.observe_flood(session, proxy, error.value)
+            raise
+        if session in self._intervals:
+            if (interval := self._intervals[session] * 0.95) > config.TG_ACCOUNT_CALL_INTERVAL:
+                self._intervals[session] = interval
+            else:
+                del self._intervals[session]
+        return result
+
+    def observe_flood(self, session: str, proxy: str | None, seconds: float) -> None:
+        now = clock.monotonic()
+        self.flood_waits += 1
+        self._hold(("account", session), now + seconds)
+        if proxy is not None:
+            self._observe_proxy_flood(session, proxy, now, seconds)
+        interval = self.account_interval(session)
+        self._intervals[session] = max(min(interval * 2, self.max_interval), interval)
+        cycle_metrics.extra["telegram"] = {"flood_waits": self.flood_waits, "backed_off": len(self._intervals)}
+
+    def _observe_proxy_flood(self, session: str, proxy: str, now: float, seconds: float) -> None:
+        floods = self._floods[proxy]
+        floods.append((now, session))
+        while floods[0][0] < now - self.flood_window:
+            floods.popleft()
+        if len({flooded for _, flooded in floods}) >= config.TG_FLOOD_GROUP_THRESHOLD:
+            self._hold(("proxy", proxy), now + seconds)
+            log.warning(f"FloodWait on {len(floods)} calls behind proxy {proxy} | Proxy paused for {seconds} seconds")
+
+    def _hold(self, key: tuple[str, str | None], until: float) -> None:
+        self._free_at[key] = max(self._free_at[key], until)
+
+
+cycle_limiter = CycleLimiter(config.MAX_ACTIVE_CYCLES)
+startup_ramp = StartupRamp()
+telegram_coordinator = TelegramCoordinator()
@@ -0,0 +1,79 @@
+import asyncio
+import atexit
+import json
+import sqlite3
+from pathlib import Path
+
+from bot.config.settings import config
+
+from . import clock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    session TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT,
+    money INTEGER NOT NULL DEFAULT 0,
+    profit INTEGER NOT NULL DEFAULT 0,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_events_session_kind_time ON events (session, kind, time);
+CREATE INDEX IF NOT EXISTS ix_events_kind_time ON events (kind, time);
+"""
+
+
+class ActionJournal:
+    """Structured record of bot actions, buffered in memory and written to SQLite in batches.
+
+    The database runs in WAL mode with synchronous=NORMAL, so a batch commit does not fsync;
+    the buffer is flushed every JOURNAL_FLUSH_INTERVAL seconds, when it holds JOURNAL_BATCH_SIZE
+    events and at exit.
+    """
+
+    def __init__(self, path: str = "journal.sqlite3") -> None:
+        self.path = Path(path)
+        self._buffer: list[tuple] = []
+        self._connection: sqlite3.Connection | None = None
+        self._flusher: asyncio.Task | None = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def write(self, session: str, kind: str, key: str | None = None, money: int = 0, profit: int = 0, **data) -> None:
+        if not config.JOURNAL_ENABLED:
+            return
+        self._buffer.append(
+            (clock.timestamp(), session, kind, key, int(money), int(profit), json.dumps(data) if data else None)
+        )
+        if len(self._buffer) >= config.JOURNAL_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        connection = self.connect()
+        with connection:
+            connection.executemany(
+                "INSERT INTO events (time, session, kind, key, money, profit, data) VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def start(self) -> None:
+        if config.JOURNAL_ENABLED and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush_periodically())
+            atexit.register(self.flush)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(config.JOURNAL_FLUSH_INTERVAL)
+            self.flush()
+
+
+journal = ActionJournal()
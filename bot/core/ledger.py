@@ -0,0 +1,68 @@
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from bot.config.settings import config
+
+from . import clock
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS done (
+    session TEXT NOT NULL,
+    action TEXT NOT NULL,
+    reset_at REAL NOT NULL,
+    PRIMARY KEY (session, action)
+);
+"""
+
+
+def next_reset(now: datetime) -> datetime:
+    reset = now.replace(hour=config.DAILY_RESET_HOUR, minute=0, second=0, microsecond=0)
+    return reset if reset > now else reset + timedelta(days=1)
+
+
+class DailyLedger:
+    """Daily actions each session has finished, kept until the game day resets.
+
+    A cycle skips a stage recorded here without sending a request. Every entry stores its reset
+    time (DAILY_RESET_HOUR UTC), so the first cycle of a new day runs the stage again. Entries are
+    held in memory and written through to SQLite, which keeps them across restarts.
+    """
+
+    def __init__(self, path: str = "ledger.sqlite3") -> None:
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._entries: dict[tuple[str, str], float] = {}
+
+    def connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(SCHEMA)
+            now = clock.timestamp()
+            with self._connection:
+                self._connection.execute("DELETE FROM done WHERE reset_at <= ?", (now,))
+            self._entries = {
+                (session, action): reset_at
+                for session, action, reset_at in self._connection.execute("SELECT session, action, reset_at FROM done")
+            }
+        return self._connection
+
+    def is_done(self, session: str, action: str) -> bool:
+        if not config.LEDGER_ENABLED:
+            return False
+        self.connect()
+        return self._entries.get((session, action), 0) > clock.timestamp()
+
+    def mark_done(self, session: str, action: str) -> None:
+        if not config.LEDGER_ENABLED:
+            return
+        connection = self.connect()
+        reset_at = next_reset(clock.now()).timestamp()
+        self._entries[(session, action)] = reset_at
+        with connection:
+            connection.execute("REPLACE INTO done VALUES (?, ?, ?)", (session, action, reset_at))
+
+
+ledger = DailyLedger()
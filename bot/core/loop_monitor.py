@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from bot.config.logger import log
+from bot.config.settings import config
+
+from .metrics import cycle_metrics, percentile
+from .sampler import frame_owner
+
+
+class LoopMonitor:
+    """Measures event loop lag and catches code that blocks the loop.
+
+    A task sleeps LOOP_LAG_INTERVAL seconds and records how late it wakes up. A watchdog thread
+    notices when that heartbeat stops for longer than LOOP_SLOW_CALLBACK seconds and logs the
+    blocking stack with the session and stage it belongs to. Lag percentiles are exported with the
+    cycle metrics.
+    """
+
+    def __init__(self) -> None:
+        self.lags: deque[float] = deque(maxlen=2000)
+        self.slow_callbacks: deque[dict] = deque(maxlen=100)
+        self._heartbeat = time.monotonic()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if not config.LOOP_LAG_INTERVAL or (self._task is not None and not self._task.done()):
+            return
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._measure())
+        threading.Thread(target=self._watch, args=(threading.get_ident(),), name="loop-watchdog", daemon=True).start()
+
+    async def _measure(self) -> None:
+        interval = config.LOOP_LAG_INTERVAL
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(interval)
+            self._heartbeat = time.monotonic()
+            self.lags.append(self._heartbeat - started - interval)
+            cycle_metrics.extra["loop_lag"] = self.summary()
+
+    def summary(self) -> dict:
+        lags = list(self.lags)
+        return {
+            "p50": percentile(lags, 0.5),
+            "p99": percentile(lags, 0.99),
+            "max": max(lags, default=0),
+            "slow_callbacks": len(self.slow_callbacks),
+        }
+
+    def _watch(self, thread_id: int) -> None:
+        threshold = config.LOOP_SLOW_CALLBACK
+        reported_heartbeat = None
+        while True:
+            time.sleep(threshold / 2)
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - config.LOOP_LAG_INTERVAL
+            if blocked < threshold or heartbeat == reported_heartbeat:
+                continue
+            if not (frame := sys._current_frames().get(thread_id)):
+                continue
+            reported_heartbeat = heartbeat
+            session, stage = frame_owner(frame) or ("loop", "-")
+            stack = "".join(traceback.format_stack(frame, limit=12))
+            self.slow_callbacks.append({"time": time.time(), "session": session, "stage": stage, "stack": stack})
+            log.opt(colors=False).warning(
+                f"Event loop blocked for more than {blocked:.2f}s by {session} (stage {stage}):\n{stack}"
+            )
+
+
+loop_monitor = LoopMonitor()
@@ -0,0 +1,117 @@
+import asyncio
+import gc
+import signal
+import sys
+import time
+import tracemalloc
+import weakref
+from collections import defaultdict
+from pathlib import Path
+from types import BuiltinFunctionType, FunctionType, ModuleType
+
+from bot.config.logger import log
+from bot.config.settings import config
+
+from .utils import num_prettier
+
+live_bots: weakref.WeakSet = weakref.WeakSet()
+
+CATEGORIES = ("dbs", "data_after", "user_profile", "quest_index", "hero_state", "http_client", "tg_client", "logger")
+SKIP_TYPES = (ModuleType, type, FunctionType, BuiltinFunctionType)
+
+
+async def retained_size(obj: object, seen: set[int], limit: int = 200_000, chunk: int = 5_000) -> int:
+    """Approximate size of everything reachable from obj and not already in seen.
+
+    Yields to the event loop every ``chunk`` objects, so the sessions keep running during the walk.
+    """
+    size, stack = 0, [obj]
+    walked = 0
+    while stack and len(seen) < limit:
+        if (walked := walked + 1) % chunk == 0:
+            await asyncio.sleep(0)
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, SKIP_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item, 0)
+        stack.extend(gc.get_referents(item))
+    return size
+
+
+class MemoryReporter:
+    """Approximate retained memory per session and category plus tracemalloc top allocations.
+
+    Session sizes come from walking each bot's attributes; objects shared by all sessions (other
+    bots, the event loop, settings, the logger core) are excluded. The walk runs as a task that
+    yields between chunks of objects, and a signal arriving while a report is being written is
+    ignored. When tracemalloc is tracing, every report also shows the allocation growth since the
+    previous report.
+    """
+
+    def __init__(self) -> None:
+        self._previous: tracemalloc.Snapshot | None = None
+        self._task: asyncio.Task | None = None
+
+    async def session_sizes(self) -> dict[str, dict[str, int]]:
+        bots = list(live_bots)
+        shared = {id(bot) for bot in bots} | {id(config), id(log._core), id(asyncio.get_running_loop())}
+        sizes = {}
+        for bot in bots:
+            seen = set(shared)
+            row = {}
+            for category in CATEGORIES:
+                value = getattr(bot, category, None)
+                row[category] = await retained_size(value, seen) if value is not None else 0
+            row["other"] = await retained_size(vars(bot), seen)
+            sizes[bot.session_name] = row
+        return sizes
+
+    async def report(self, top: int = 15) -> str:
+        sizes = await self.session_sizes()
+        totals = defaultdict(int)
+        for row in sizes.values():
+            for category, size in row.items():
+                totals[category] += size
+        total = sum(totals.values())
+        count = max(len(sizes), 1)
+        lines = [
+            f"Sessions: {len(sizes)} | retained ~{num_prettier(total)}B | per session ~{num_prettier(total // count)}B"
+        ]
+        lines += [
+            f"    {category:<14} ~{num_prettier(size // count)}B per session"
+            for category, size in sorted(totals.items(), key=lambda item: -item[1])
+        ]
+        largest = sorted(sizes.items(), key=lambda item: -sum(item[1].values()))[:5]
+        lines += [f"    largest: {name} ~{num_prettier(sum(row.values()))}B" for name, row in largest]
+
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen *>")]
+            )
+            lines.append(f"Top {top} allocations:")
+            lines += [f"    {stat}" for stat in snapshot.statistics("lineno")[:top]]
+            if self._previous is not None:
+                lines.append(f"Top {top} growth since previous report:")
+                lines += [f"    {stat}" for stat in snapshot.compare_to(self._previous, "lineno")[:top]]
+            self._previous = snapshot
+        return "\n".join(lines)
+
+    async def write_report(self, directory: str = "profiles") -> None:
+        path = Path(directory) / f"memory-{time.strftime('%Y%m%d-%H%M%S')}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = await self.report()
+        path.write_text(report, encoding="utf-8")
+        log.opt(colors=False).info(f"Memory report saved to {path}\n{report.splitlines()[0]}")
+
+    def start_report(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.write_report())
+
+    def install_signal_handler(self) -> None:
+        """Write a report on SIGUSR2 (POSIX only)."""
+        if hasattr(signal, "SIGUSR2"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR2, self.start_report)
+
+
+memory_reporter = MemoryReporter()
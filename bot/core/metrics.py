@@ -0,0 +1,81 @@
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+
+from bot.config.logger import log
+from bot.config.settings import config
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class CycleMetrics:
+    """Per-stage cycle timings from all sessions: active time, deliberate sleep and request count.
+
+    Keeps the latest ``window`` samples of every stage and writes a summary table to the log and
+    a JSON snapshot every METRICS_INTERVAL seconds.
+    """
+
+    window = 2000
+
+    def __init__(self) -> None:
+        self.samples: dict[str, deque[tuple[float, float, int]]] = defaultdict(lambda: deque(maxlen=self.window))
+        self.extra: dict[str, dict] = {}
+        self._reporter: asyncio.Task | None = None
+
+    def record(self, stage: str, active: float, sleep: float, requests: int) -> None:
+        self.samples[stage].append((active, sleep, requests))
+
+    def snapshot(self) -> dict:
+        stages = {}
+        for stage, samples in self.samples.items():
+            active = [sample[0] for sample in samples]
+            sleep = [sample[1] for sample in samples]
+            requests = [sample[2] for sample in samples]
+            stages[stage] = {
+                "count": len(samples),
+                "active_p50": percentile(active, 0.5),
+                "active_p90": percentile(active, 0.9),
+                "active_p99": percentile(active, 0.99),
+                "sleep_mean": sum(sleep) / len(sleep),
+                "requests_mean": sum(requests) / len(requests),
+            }
+        return {"time": time.time(), "stages": stages, **self.extra}
+
+    def table(self, snapshot: dict) -> str:
+        lines = [f"{'stage':<12} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'sleep':>8} {'requests':>8}"]
+        for stage, row in sorted(snapshot["stages"].items(), key=lambda item: -item[1]["active_p50"]):
+            lines.append(
+                f"{stage:<12} {row['count']:>6} {row['active_p50']:>8.2f} {row['active_p90']:>8.2f} "
+                f"{row['active_p99']:>8.2f} {row['sleep_mean']:>8.1f} {row['requests_mean']:>8.1f}"
+            )
+        if lag := snapshot.get("loop_lag"):
+            lines.append(
+                f"loop lag p50 {lag['p50']:.3f} p99 {lag['p99']:.3f} max {lag['max']:.3f} "
+                f"slow callbacks {lag['slow_callbacks']}"
+            )
+        return "\n".join(lines)
+
+    def write(self, path: str = "metrics.json") -> dict:
+        snapshot = self.snapshot()
+        Path(path).write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+        return snapshot
+
+    def start(self) -> None:
+        if config.METRICS_INTERVAL and (self._reporter is None or self._reporter.done()):
+            self._reporter = asyncio.create_task(self._report_periodically())
+
+    async def _report_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(config.METRICS_INTERVAL)
+            snapshot = self.write()
+            log.info(f"Stage timings, seconds per stage call:\n{self.table(snapshot)}")
+
+
+cycle_metrics = CycleMetrics()
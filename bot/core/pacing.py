@@ -0,0 +1,46 @@
+import random
+
+from bot.config.settings import config
+
+
+class CyclePacer:
+    """Pauses between a session's actions, fitted to a per-cycle time budget.
+
+    Every pause keeps the length its call site asks for (``random() * delay + additional_delay`` on
+    average) with a lognormal spread of PAUSE_SIGMA around it. With CYCLE_PAUSE_BUDGET set the pauses
+    of a cycle are scaled to share the budget: the expected amount of pausing comes from previous
+    cycles, so a light cycle keeps its natural pauses and ends early, while a busy one has them
+    compressed to finish within the budget. ``floor`` is a pause that must not be shortened, such as
+    the seconds a tap batch covers.
+    """
+
+    smoothing = 0.3
+
+    def __init__(self) -> None:
+        self.expected_weight: float | None = None
+        self._weight = 0.0
+        self._spent = 0.0
+
+    def start_cycle(self) -> None:
+        self._weight = self._spent = 0.0
+
+    def finish_cycle(self) -> None:
+        if self.expected_weight is None:
+            self.expected_weight = self._weight
+        else:
+            self.expected_weight += self.smoothing * (self._weight - self.expected_weight)
+
+    def delay(self, delay: float, additional_delay: float, floor: float = 0) -> float:
+        if not config.CYCLE_PAUSE_BUDGET:
+            return max(random.random() * delay + additional_delay, floor)
+        weight = delay / 2 + additional_delay
+        self._weight += weight
+        sigma = config.PAUSE_SIGMA
+        pause = weight * random.lognormvariate(-(sigma**2) / 2, sigma)
+        if self.expected_weight:
+            remaining_weight = max(self.expected_weight - self._weight + weight, weight)
+            remaining_budget = max(config.CYCLE_PAUSE_BUDGET - self._spent, 0)
+            pause *= min(1.0, remaining_budget / remaining_weight)
+        pause = max(pause, config.PAUSE_MIN, floor)
+        self._spent += pause
+        return pause
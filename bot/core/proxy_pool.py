@@ -0,0 +1,127 @@
+import asyncio
+import statistics
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+import aiohttp
+from aiohttp_proxy import ProxyConnector
+from aiohttp_socks import ProxyConnector as SocksProxyConnector
+from better_proxy import Proxy
+
+from bot.config.logger import log
+from bot.config.settings import config
+
+
+def read_proxies(path: str = "proxies.txt") -> list[str]:
+    with Path(path).open(encoding="utf-8") as file:
+        return [Proxy.from_str(proxy=row.strip()).as_url for row in file if row.strip()]
+
+
+def make_proxy_connector(proxy: str | None) -> aiohttp.BaseConnector | None:
+    if proxy and "socks" in proxy:
+        return SocksProxyConnector.from_url(proxy)
+    if proxy:
+        return ProxyConnector.from_url(proxy)
+    return None
+
+
+class ProxyStats:
+    window = 20
+
+    def __init__(self) -> None:
+        self.latencies: deque[float] = deque(maxlen=self.window)
+        self.failures: deque[bool] = deque(maxlen=self.window)
+
+    def add(self, elapsed: float, ok: bool) -> None:
+        self.failures.append(not ok)
+        if ok:
+            self.latencies.append(elapsed)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.failures) / len(self.failures) if self.failures else 0
+
+    @property
+    def latency(self) -> float:
+        return statistics.median(self.latencies) if self.latencies else 0
+
+    @property
+    def degraded(self) -> bool:
+        return self.error_rate > config.PROXY_MAX_ERROR_RATE or self.latency > config.PROXY_MAX_LATENCY
+
+
+class ProxyPool:
+    """Keeps rolling health per proxy and sticky session bindings that move off degraded proxies."""
+
+    def __init__(self) -> None:
+        self.stats: dict[str | None, ProxyStats] = {}
+        self._bindings: dict[str, str | None] = {}
+        self._monitor: asyncio.Task | None = None
+
+    def __bool__(self) -> bool:
+        return any(proxy is not None for proxy in self.stats)
+
+    def load(self, proxies: list[str | None]) -> None:
+        self.stats = {proxy: self.stats.get(proxy, ProxyStats()) for proxy in proxies}
+
+    def manages(self, proxy: str | None) -> bool:
+        return bool(self) and proxy in self.stats
+
+    def report(self, proxy: str | None, elapsed: float, ok: bool) -> None:
+        if stats := self.stats.get(proxy):
+            stats.add(elapsed, ok)
+
+    def acquire(self, session_name: str) -> str | None:
+        if not self.stats:
+            return None
+        current = self._bindings.get(session_name)
+        if session_name in self._bindings and current in self.stats and not self.stats[current].degraded:
+            return current
+        healthy = [proxy for proxy, stats in self.stats.items() if not stats.degraded] or list(self.stats)
+        load = Counter(self._bindings.values())
+        proxy = min(healthy, key=lambda p: (load[p], self.stats[p].error_rate, self.stats[p].latency))
+        self._bindings[session_name] = proxy
+        return proxy
+
+    def should_switch(self, session_name: str) -> bool:
+        current = self._bindings.get(session_name)
+        if current not in self.stats or not self.stats[current].degraded:
+            return False
+        return any(not stats.degraded for stats in self.stats.values())
+
+    async def probe(self, proxy: str | None) -> None:
+        started = time.perf_counter()
+        try:
+            async with aiohttp.ClientSession(
+                connector=make_proxy_connector(proxy), timeout=aiohttp.ClientTimeout(total=config.PROXY_MAX_LATENCY)
+            ) as http_client, http_client.get(config.PROXY_CHECK_URL) as response:
+                response.raise_for_status()
+        except Exception as error:
+            self.report(proxy, time.perf_counter() - started, ok=False)
+            log.debug(f"Proxy {proxy} probe failed: {error}")
+        else:
+            self.report(proxy, time.perf_counter() - started, ok=True)
+
+    async def probe_all(self) -> None:
+        semaphore = asyncio.Semaphore(config.PROXY_CHECK_CONCURRENCY)
+
+        async def _probe(proxy: str | None) -> None:
+            async with semaphore:
+                await self.probe(proxy)
+
+        await asyncio.gather(*[_probe(proxy) for proxy in self.stats])
+        degraded = sum(stats.degraded for stats in self.stats.values())
+        log.info(f"Proxies checked: <g>{len(self.stats) - degraded}</g> healthy | <red>{degraded}</red> degraded")
+
+    def start_monitor(self) -> None:
+        if self._monitor is None or self._monitor.done():
+            self._monitor = asyncio.create_task(self.monitor())
+
+    async def monitor(self) -> None:
+        while True:
+            await asyncio.sleep(config.PROXY_CHECK_INTERVAL)
+            await self.probe_all()
+
+
+proxy_pool = ProxyPool()
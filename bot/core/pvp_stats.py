@@ -0,0 +1,110 @@
+import json
+import os
+import random
+from collections import Counter, deque
+from pathlib import Path
+from typing import NamedTuple
+
+from bot.config.settings import config
+
+from . import clock
+
+
+class FightRecord(NamedTuple):
+    time: int
+    league: str
+    contract: int
+    strategy: str
+    opponent_strategy: str
+    won: bool
+
+
+class FightLog:
+    """Append-only PvP fight log shared by all sessions.
+
+    Win/fight counters per league and per (league, strategy) are updated on every append, for
+    all time and for a rolling window of the latest fights, so win rates are read in O(1).
+    When the file grows past PVP_LOG_MAX_RECORDS it is compacted to one summary line with the
+    all-time counters followed by the records of the rolling window.
+    """
+
+    def __init__(self, path: str = "pvp_fights.jsonl") -> None:
+        self.path = Path(path)
+        self.wins: Counter = Counter()
+        self.fights: Counter = Counter()
+        self.window: deque[FightRecord] = deque()
+        self.window_wins: Counter = Counter()
+        self.window_fights: Counter = Counter()
+        self._records_in_file = 0
+        self._file = None
+
+    def _open(self) -> None:
+        if self._file is not None:
+            return
+        if self.path.exists():
+            with self.path.open(encoding="utf-8") as file:
+                for line in file:
+                    self._replay(json.loads(line))
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def _replay(self, row: dict) -> None:
+        if row.get("type") == "summary":
+            for key, (wins, fights) in row["totals"].items():
+                self.wins[tuple(key.split("|"))] += wins
+                self.fights[tuple(key.split("|"))] += fights
+            return
+        self._count(FightRecord(**row))
+        self._records_in_file += 1
+
+    def _count(self, record: FightRecord) -> None:
+        for key in ((record.league,), (record.league, record.strategy)):
+            self.wins[key] += record.won
+            self.fights[key] += 1
+            self.window_wins[key] += record.won
+            self.window_fights[key] += 1
+        self.window.append(record)
+        if len(self.window) > config.PVP_STATS_WINDOW:
+            expired = self.window.popleft()
+            for key in ((expired.league,), (expired.league, expired.strategy)):
+                self.window_wins[key] -= expired.won
+                self.window_fights[key] -= 1
+
+    def record(self, league: str, contract: int, strategy: str, opponent_strategy: str, won: bool) -> None:
+        self._open()
+        record = FightRecord(int(clock.timestamp()), league, contract, strategy, opponent_strategy, won)
+        self._count(record)
+        self._file.write(json.dumps(record._asdict()) + "\n")
+        self._file.flush()
+        self._records_in_file += 1
+        if self._records_in_file > config.PVP_LOG_MAX_RECORDS:
+            self.compact()
+
+    def compact(self) -> None:
+        totals = {"|".join(key): [self.wins[key], self.fights[key]] for key in self.fights}
+        for record in self.window:
+            for key in ((record.league,), (record.league, record.strategy)):
+                totals["|".join(key)][0] -= record.won
+                totals["|".join(key)][1] -= 1
+        tmp_path = self.path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as file:
+            file.write(json.dumps({"type": "summary", "totals": totals}) + "\n")
+            file.writelines(json.dumps(record._asdict()) + "\n" for record in self.window)
+        self._file.close()
+        os.replace(tmp_path, self.path)
+        self._file = self.path.open("a", encoding="utf-8")
+        self._records_in_file = len(self.window)
+
+    def win_rate(self, league: str, strategy: str | None = None, rolling: bool = True) -> float:
+        """Win rate with a uniform prior, so strategies without fights start at 0.5."""
+        self._open()
+        key = (league,) if strategy is None else (league, strategy)
+        wins, fights = (self.window_wins, self.window_fights) if rolling else (self.wins, self.fights)
+        return (wins[key] + 1) / (fights[key] + 2)
+
+    def best_strategy(self, league: str, strategies: list[str]) -> str:
+        if random.random() < config.PVP_EXPLORE_RATE:
+            return random.choice(strategies)
+        return max(strategies, key=lambda strategy: self.win_rate(league, strategy))
+
+
+fight_log = FightLog()
@@ -0,0 +1,42 @@
+import difflib
+import re
+import unicodedata
+from typing import Any
+
+# Cyrillic letters that look like Latin ones, quest titles sometimes mix them ("How сloud storage works?")
+LOOKALIKES = str.maketrans("авекмнорстухіјѕԁӏё", "abekmhopctyxijsdle")
+NON_WORD = re.compile(r"[\W_]+")
+DIGITS = re.compile(r"\d+")
+
+
+def normalize_title(title: str) -> str:
+    title = unicodedata.normalize("NFKC", title).casefold().translate(LOOKALIKES)
+    return NON_WORD.sub(" ", title).strip()
+
+
+class QuestIndex:
+    """Solved quest keys and youtube codes by normalised title, built once per data refresh."""
+
+    close_match_cutoff = 0.9
+
+    def __init__(self, quests: list[dict], codes: dict[str, Any]) -> None:
+        self.solved = {quest["key"] for quest in quests}
+        self.codes = {normalize_title(title): code for title, code in codes.items()}
+        self.numbers = {title: DIGITS.findall(title) for title in self.codes}
+
+    def is_solved(self, quest_key: str) -> bool:
+        return quest_key in self.solved
+
+    def mark_solved(self, quest_key: str) -> None:
+        self.solved.add(quest_key)
+
+    def code_for(self, title: str) -> Any | None:
+        normalized = normalize_title(title)
+        if normalized in self.codes:
+            return self.codes[normalized]
+        # a close match may only differ in letters, "Episode 14" must never get the code of "Episode 13"
+        numbers = DIGITS.findall(normalized)
+        candidates = [title for title, title_numbers in self.numbers.items() if title_numbers == numbers]
+        if match := difflib.get_close_matches(normalized, candidates, n=1, cutoff=self.close_match_cutoff):
+            return self.codes[match[0]]
+        return None
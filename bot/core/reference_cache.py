@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import json
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import aiohttp
+
+from bot.config.logger import log
+
+from . import clock
+
+
+class ReferenceCache:
+    """External reference data stored on disk and revalidated with conditional GETs.
+
+    A fresh copy is served from memory, a stale one is revalidated with ETag/Last-Modified and
+    the last good copy is served when the source cannot be reached, for ``retry_after`` seconds
+    before the source is tried again. ``observe`` gets the latency and outcome of every request.
+    """
+
+    retry_after = 60
+
+    def __init__(self, directory: str = ".cache/reference") -> None:
+        self.directory = Path(directory)
+        self._memory: dict[str, tuple[float, str]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        name = hashlib.sha1(url.encode()).hexdigest()
+        return self.directory / f"{name}.body", self.directory / f"{name}.meta.json"
+
+    def _read(self, url: str) -> tuple[str | None, dict]:
+        body_path, meta_path = self._paths(url)
+        try:
+            return body_path.read_text(encoding="utf-8"), json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None, {}
+
+    def _write(self, url: str, body: str, headers: dict) -> None:
+        body_path, meta_path = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        body_path.write_text(body, encoding="utf-8")
+        meta = {"url": url, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    async def fetch(
+        self,
+        http_client: aiohttp.ClientSession,
+        url: str,
+        max_age: float,
+        observe: Callable[[float, bool], None] | None = None,
+    ) -> str:
+        if (cached := self._memory.get(url)) and clock.monotonic() < cached[0]:
+            return cached[1]
+        async with self._locks.setdefault(url, asyncio.Lock()):
+            if (cached := self._memory.get(url)) and clock.monotonic() < cached[0]:
+                return cached[1]
+            body, meta = self._read(url)
+            headers = {}
+            if body is not None and meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if body is not None and meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+            started = perf_counter()
+            try:
+                async with http_client.get(url, headers=headers) as response:
+                    if response.status != 304:
+                        response.raise_for_status()
+                        body = await response.text()
+                        self._write(url, body, response.headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if observe:
+                    observe(perf_counter() - started, False)
+                if body is None:
+                    raise
+                log.warning(f"Using saved copy of {url} for {self.retry_after} seconds: {error}")
+                self._memory[url] = (clock.monotonic() + self.retry_after, body)
+                return body
+            if observe:
+                observe(perf_counter() - started, True)
+            self._memory[url] = (clock.monotonic() + max_age, body)
+            return body
+
+
+class JsonFile:
+    """Local JSON file that is read again only when its mtime changes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self._mtime: int | None = None
+        self._data: Any = None
+
+    def load(self) -> Any:
+        mtime = self.path.stat().st_mtime_ns
+        if mtime != self._mtime:
+            with self.path.open(encoding="utf-8") as file:
+                self._data = json.load(file)
+            self._mtime = mtime
+        return self._data
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,80 @@
+import asyncio
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+
+from bot.config.logger import log
+
+from .api import CryptoBotApi
+
+
+def frame_owner(frame: FrameType) -> tuple[str, str] | None:
+    """Session and stage of the innermost bot method on the stack, if any."""
+    while frame is not None:
+        if isinstance(owner := frame.f_locals.get("self"), CryptoBotApi):
+            return owner.session_name, owner.current_stage or "-"
+        frame = frame.f_back
+    return None
+
+
+class StackSampler:
+    """Samples the event loop thread from a helper thread for a bounded window.
+
+    Each sample is a stack attributed to the session and cycle stage that was running, written in
+    the collapsed format (``session;stage;module:function;... count``) that flamegraph.pl and
+    speedscope read. Nothing runs while the sampler is off.
+    """
+
+    def __init__(self) -> None:
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval: float = 0.005, directory: str = "profiles") -> None:
+        if self.running:
+            log.warning("Profiler is already running")
+            return
+        path = Path(directory) / f"profile-{time.strftime('%Y%m%d-%H%M%S')}.collapsed"
+        self._thread = threading.Thread(
+            target=self._sample,
+            args=(threading.get_ident(), time.monotonic() + seconds, interval, path),
+            name="stack-sampler",
+            daemon=True,
+        )
+        self._thread.start()
+        log.info(f"Profiling for {seconds} seconds into {path}")
+
+    def _sample(self, thread_id: int, deadline: float, interval: float, path: Path) -> None:
+        stacks: Counter = Counter()
+        while time.monotonic() < deadline:
+            if frame := sys._current_frames().get(thread_id):
+                stacks[self._collapse(frame)] += 1
+            time.sleep(interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        log.info(f"Profile saved: {path} ({sum(stacks.values())} samples)")
+
+    @staticmethod
+    def _collapse(frame: FrameType) -> str:
+        session, stage = frame_owner(frame) or ("loop", "-")
+        functions = []
+        while frame is not None:
+            functions.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        return ";".join([session, stage, *reversed(functions)])
+
+    def install_signal_handler(self, seconds: float) -> None:
+        """Start a profiling window on SIGUSR1 (POSIX only)."""
+        if not hasattr(signal, "SIGUSR1"):
+            return
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.start, seconds)
+
+
+stack_sampler = StackSampler()
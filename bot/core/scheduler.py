@@ -0,0 +1,71 @@
+import asyncio
+import heapq
+import itertools
+import random
+from datetime import datetime
+
+from pytz import UTC
+
+from bot.config.settings import config
+
+from . import clock
+from .models import Profile, UserDataAfter
+from .taps import TapPlanner
+
+
+def next_wake_delay(profile: Profile | None, data_after: UserDataAfter | None, taps_paused_for: float = 0) -> int:
+    """Seconds until the session has useful work again: full tap energy or a finished skill upgrade."""
+    candidates = []
+    if profile and config.TAPS_ENABLED and profile.energy_recovery:
+        energy_full_in = TapPlanner(profile).seconds_until_full(profile.energy)
+        candidates.append(max(energy_full_in, taps_paused_for))
+
+    if data_after and isinstance(data_after.skills, dict):
+        now = clock.now()
+        for skill in data_after.skills.values():
+            if finish_time := skill.get("finishUpgradeDate"):
+                finish_at = datetime.strptime(finish_time, "%Y-%m-%d %H:%M:%S").replace(tzinfo=UTC)
+                if (seconds := (finish_at - now).total_seconds()) > 0:
+                    candidates.append(seconds)
+
+    max_sleep = random.randint(*config.BOT_SLEEP_TIME)
+    delay = max(config.MIN_SLEEP_TIME, min(min(candidates, default=max_sleep), max_sleep))
+    return int(delay + random.randint(*config.WAKE_JITTER))
+
+
+class WakeScheduler:
+    """One timer heap for all sessions instead of an independent sleep per session."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._runner: asyncio.Task | None = None
+
+    async def sleep(self, delay: float) -> None:
+        await self.sleep_until(clock.monotonic() + delay)
+
+    async def sleep_until(self, wake_at: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        entry = (wake_at, next(self._counter), future)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry or self._runner is None or self._runner.done():
+            self._rearm()
+        await clock.wait(future)
+
+    def _rearm(self) -> None:
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+        self._runner = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._heap:
+            if (delay := self._heap[0][0] - clock.monotonic()) > 0:
+                await clock.sleep(delay)
+            now = clock.monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                _, _, future = heapq.heappop(self._heap)
+                if not future.done():
+                    future.set_result(None)
+
+
+wake_scheduler = WakeScheduler()
@@ -0,0 +1,143 @@
+import sqlite3
+from functools import cache
+from pathlib import Path
+
+from pyrogram.storage import FileStorage, MemoryStorage
+
+SESSION_FIELDS = ("dc_id", "api_id", "test_mode", "auth_key", "date", "user_id", "is_bot")
+PEER_COLUMNS = ("id", "access_hash", "type", "username", "phone_number", "last_update_on")
+
+
+class SessionDatabase:
+    """All Pyrogram sessions in one SQLite file instead of one file per account.
+
+    Rows mirror the ``sessions`` and ``peers`` tables of a ``.session`` file with the session
+    name added to the key, so a session is loaded with two indexed lookups.
+    """
+
+    def __init__(self, path: str = "sessions.sqlite3") -> None:
+        self.path = Path(path)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                name TEXT PRIMARY KEY, dc_id INTEGER, api_id INTEGER, test_mode INTEGER, auth_key BLOB,
+                date INTEGER, user_id INTEGER, is_bot INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS peers (
+                session TEXT NOT NULL, id INTEGER NOT NULL, access_hash INTEGER, type TEXT, username TEXT,
+                phone_number TEXT, last_update_on INTEGER, PRIMARY KEY (session, id)
+            );
+            CREATE INDEX IF NOT EXISTS peers_username ON peers (session, username);
+            """
+        )
+
+    def names(self) -> list[str]:
+        return [name for (name,) in self._connection.execute("SELECT name FROM sessions ORDER BY name")]
+
+    def load(self, name: str) -> tuple[dict, list[tuple]] | None:
+        row = self._connection.execute(
+            f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        peers = self._connection.execute(
+            f"SELECT {', '.join(PEER_COLUMNS)} FROM peers WHERE session = ?", (name,)
+        ).fetchall()
+        return dict(zip(SESSION_FIELDS, row)), peers
+
+    def save(self, name: str, fields: dict, peers: list[tuple]) -> None:
+        with self._connection:
+            self._connection.execute(
+                f"REPLACE INTO sessions (name, {', '.join(SESSION_FIELDS)}) VALUES (?{', ?' * len(SESSION_FIELDS)})",
+                (name, *(fields[field] for field in SESSION_FIELDS)),
+            )
+            self._connection.execute("DELETE FROM peers WHERE session = ?", (name,))
+            self._connection.executemany(
+                f"INSERT INTO peers (session, {', '.join(PEER_COLUMNS)}) VALUES (?{', ?' * len(PEER_COLUMNS)})",
+                [(name, *peer) for peer in peers],
+            )
+
+    def delete(self, name: str) -> None:
+        with self._connection:
+            self._connection.execute("DELETE FROM sessions WHERE name = ?", (name,))
+            self._connection.execute("DELETE FROM peers WHERE session = ?", (name,))
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def restore(conn: sqlite3.Connection, fields: dict, peers: list[tuple]) -> None:
+    """Fill a freshly created Pyrogram storage with a stored session."""
+    with conn:
+        conn.execute(
+            f"UPDATE sessions SET {', '.join(f'{field} = ?' for field in SESSION_FIELDS)}",
+            tuple(fields[field] for field in SESSION_FIELDS),
+        )
+        conn.executemany(
+            f"INSERT INTO peers ({', '.join(PEER_COLUMNS)}) VALUES ({', '.join('?' * len(PEER_COLUMNS))})", peers
+        )
+
+
+def persist(conn: sqlite3.Connection, name: str, database: SessionDatabase) -> None:
+    fields = dict(zip(SESSION_FIELDS, conn.execute(f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions").fetchone()))
+    database.save(name, fields, conn.execute(f"SELECT {', '.join(PEER_COLUMNS)} FROM peers").fetchall())
+
+
+class DatabaseStorage(MemoryStorage):
+    """Pyrogram storage that lives in memory while the client runs and is kept in a SessionDatabase."""
+
+    def __init__(self, name: str, database: SessionDatabase) -> None:
+        super().__init__(name)
+        self.database = database
+
+    async def open(self) -> None:
+        await super().open()
+        if (stored := self.database.load(self.name)) is not None:
+            restore(self.conn, *stored)
+
+    async def save(self) -> None:
+        await super().save()
+        await self._persist()
+
+    async def close(self) -> None:
+        await self._persist()
+        await super().close()
+
+    async def delete(self) -> None:
+        self.database.delete(self.name)
+
+    async def _persist(self) -> None:
+        # nothing to keep until the login has produced an auth key
+        if await self.auth_key() is not None:
+            persist(self.conn, self.name, self.database)
+
+
+async def import_session_file(path: Path, database: SessionDatabase) -> None:
+    storage = FileStorage(path.stem, path.parent)
+    await storage.open()
+    try:
+        persist(storage.conn, path.stem, database)
+    finally:
+        await storage.close()
+
+
+async def export_session_file(name: str, database: SessionDatabase, directory: Path) -> Path:
+    """Write a session back to ``<directory>/<name>.session``, replacing an existing file."""
+    if (stored := database.load(name)) is None:
+        raise KeyError(name)
+    path = directory / f"{name}{FileStorage.FILE_EXTENSION}"
+    path.unlink(missing_ok=True)
+    storage = FileStorage(name, directory)
+    await storage.open()
+    try:
+        restore(storage.conn, *stored)
+    finally:
+        await storage.close()
+    return path
+
+
+@cache
+def get_session_database() -> SessionDatabase:
+    return SessionDatabase()
@@ -0,0 +1,53 @@
+from bot.config.settings import config
+
+from . import clock
+from .models import Profile
+
+
+class HeroState:
+    """Projects money (moneyPerHour) and tap energy (recoveryPerSecond) between server responses.
+
+    Every response carrying the hero moves the projection. Only authoritative snapshots, the
+    balance sync and user/data/all, are compared with the projection and reset the sync age; the
+    other endpoints change the money on purpose.
+    """
+
+    def __init__(self) -> None:
+        self.hero: dict = {}
+        self.synced_at: float | None = None
+        self.projected_at: float | None = None
+        self.drift = 0.0
+
+    def reconcile(self, hero: dict, authoritative: bool = False) -> None:
+        now = clock.monotonic()
+        if authoritative:
+            if self.projected_at is not None and "money" in self.hero:
+                money = int(hero["money"])
+                self.drift = abs(self.projected_money(now) - money) / max(money, 1)
+            self.synced_at = now
+        self.hero = {**self.hero, **hero}
+        self.projected_at = now
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last authoritative snapshot."""
+        return clock.monotonic() - self.synced_at if self.synced_at is not None else float("inf")
+
+    def needs_sync(self) -> bool:
+        return (
+            self.synced_at is None
+            or self.age > config.BALANCE_SYNC_MAX_AGE
+            or self.drift > config.BALANCE_SYNC_TOLERANCE
+            or "earns" not in self.hero
+        )
+
+    def projected_money(self, now: float | None = None) -> int:
+        elapsed = (now or clock.monotonic()) - self.projected_at
+        return int(int(self.hero["money"]) + int(self.hero["moneyPerHour"]) * elapsed / 3600)
+
+    def projected_profile(self) -> Profile:
+        elapsed = clock.monotonic() - self.projected_at
+        task = dict(self.hero["earns"]["task"])
+        task["energy"] = min(task["energy"] + task["recoveryPerSecond"] * elapsed, task["limit"])
+        hero = {**self.hero, "money": self.projected_money(), "earns": {"task": task}}
+        return Profile(hero=hero)
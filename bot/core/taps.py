@@ -0,0 +1,54 @@
+import math
+import random
+from typing import NamedTuple
+
+from bot.config.settings import config
+
+from .models import Profile
+
+
+class TapBatch(NamedTuple):
+    seconds: int
+    amount: int
+    energy: int
+
+
+class TapPlanner:
+    """Plans the fewest tap requests that drain the energy, counting what recovers while tapping.
+
+    Every tap costs half of the money it earns in energy (the game rule used by the web client).
+    When the recovery keeps up with the taps the energy never drains, then only the requests needed
+    to spend the energy of the first batch are planned.
+    """
+
+    def __init__(self, profile: Profile) -> None:
+        self.money_per_tap = profile.money_per_tap
+        self.limit = profile.limit
+        self.energy_recovery = profile.energy_recovery
+        self.requests_left: int | None = None
+
+    def next_batch(self, energy: float) -> TapBatch | None:
+        taps_per_second = random.randint(*config.TAPS_PER_SECOND)
+        spend_per_second = self.money_per_tap * taps_per_second / 2
+        if energy < spend_per_second:
+            return None
+        drain_per_second = spend_per_second - self.energy_recovery
+        if drain_per_second <= 0:
+            drain_per_second = spend_per_second
+            if self.requests_left is None:
+                self.requests_left = math.ceil(energy / spend_per_second / config.TAP_MAX_SECONDS_PER_REQUEST)
+            if self.requests_left <= 0:
+                return None
+            self.requests_left -= 1
+
+        drain_seconds = energy / drain_per_second
+        requests = math.ceil(drain_seconds / config.TAP_MAX_SECONDS_PER_REQUEST)
+        seconds = max(1, math.floor(drain_seconds / requests))
+        amount = self.money_per_tap * taps_per_second * seconds
+        energy_left = energy - math.ceil(amount / 2) + self.energy_recovery * seconds
+        return TapBatch(seconds=seconds, amount=amount, energy=int(min(max(energy_left, 0), self.limit)))
+
+    def seconds_until_full(self, energy: float) -> float:
+        if not self.energy_recovery:
+            return math.inf
+        return max(self.limit - energy, 0) / self.energy_recovery
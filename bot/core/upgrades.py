@@ -0,0 +1,16 @@
+from bot.config.settings import Settings, config
+
+
+def wants_hero_upgrade(title: str, weight: float, settings: Settings = config) -> bool:
+    """A skill the hero pass upgrades: it adds income, is not skipped and pays back at least SKILL_WEIGHT."""
+    return bool(weight) and title not in settings.SKIP_TO_UPGRADE_SKILLS and weight >= settings.SKILL_WEIGHT
+
+
+def wants_mining_upgrade(key: str, next_level: int, price: int, settings: Settings = config) -> bool:
+    """A mining skill level the mining pass upgrades within the MAX_MINING_* limits."""
+    return (
+        key in settings.MINING_ENERGY_SKILLS
+        and next_level <= settings.MAX_MINING_ENERGY_RECOVERY_UPGRADE_LEVEL
+        or next_level <= settings.MAX_MINING_UPGRADE_LEVEL
+        or price <= settings.MAX_MINING_UPGRADE_COSTS
+    )
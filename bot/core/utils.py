@@ -1,12 +1,10 @@
-import json
-from functools import lru_cache
-from pathlib import Path
+from .reference_cache import JsonFile
+
+youtube_codes = JsonFile("youtube.json")
 
 
-@lru_cache
 def load_codes_from_files() -> dict:
-    with Path("youtube.json").open("r", encoding="utf-8") as file:
-        return json.load(file)
+    return youtube_codes.load()
 
 
 def num_prettier(num: int) -> str:
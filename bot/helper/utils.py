@@ -1,14 +1,14 @@
-import asyncio
 import hashlib
 import json
 import random
 from collections.abc import Callable
 from functools import wraps
-from time import time
+from time import perf_counter, time
 
-import aiohttp
 from loguru import logger
 
+from bot.core import clock
+
 
 def error_handler(delay=3):
     def decorator(func):
@@ -18,7 +18,7 @@ def error_handler(delay=3):
                 return await func(*args, **kwargs)
             except Exception as error:
                 logger.error(f"Error in {func.__name__}: {error}")
-                await asyncio.sleep(random.randint(delay, delay * 2))
+                await clock.sleep(random.randint(delay, delay * 2))
                 raise
 
         return wrapper
@@ -29,6 +29,7 @@ def error_handler(delay=3):
 def handle_request(
     endpoint: str,
     full_url: bool = False,
+    base: str = "api_url",
     method: str = "POST",
     raise_for_status: bool = True,
     json_body: dict | None = None,
@@ -36,18 +37,23 @@ def handle_request(
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(self, *args, **kwargs):
-            url = endpoint if full_url else self.api_url + endpoint
-            if method.upper() == "POST":
-                _json_body = kwargs.get("json_body") or json_body or {}
-                set_sign_headers(http_client=self.http_client, data=_json_body)
-                response = await self.http_client.post(url, json=_json_body)
-            elif method.upper() == "GET":
-                response = await self.http_client.get(url)
-            else:
-                msg = "Unsupported HTTP method"
-                raise ValueError(msg)
-            if raise_for_status:
-                response.raise_for_status()
+            url = endpoint if full_url else getattr(self, base) + endpoint
+            started = perf_counter()
+            try:
+                if method.upper() == "POST":
+                    _json_body = kwargs.get("json_body") or json_body or {}
+                    response = await self.http_client.post(url, json=_json_body, headers=sign_headers(_json_body))
+                elif method.upper() == "GET":
+                    response = await self.http_client.get(url)
+                else:
+                    msg = "Unsupported HTTP method"
+                    raise ValueError(msg)
+                if raise_for_status:
+                    response.raise_for_status()
+            except Exception:
+                self.observe_request(endpoint, perf_counter() - started, ok=False)
+                raise
+            self.observe_request(endpoint, perf_counter() - started, ok=True)
 
             content_type = response.headers.get("Content-Type", "")
             if "application/json" in content_type:
@@ -66,14 +72,13 @@ def handle_request(
     return decorator
 
 
-def set_sign_headers(http_client: aiohttp.ClientSession, data: dict) -> None:
+def sign_headers(data: dict) -> dict[str, str]:
+    """Per-request signature headers, so concurrent requests of one session cannot mix them up."""
     time_string = str(int(time()))
     json_string = json.dumps(data)
     hash_object = hashlib.md5()
     hash_object.update(f"{time_string}_{json_string}".encode())
-    hash_string = hash_object.hexdigest()
-    http_client.headers["Api-Time"] = time_string
-    http_client.headers["Api-Hash"] = hash_string
+    return {"Api-Time": time_string, "Api-Hash": hash_object.hexdigest()}
 
 
 def error_handler(delay=3):
@@ -84,7 +89,7 @@ def error_handler(delay=3):
                 return await func(self, *args, **kwargs)
             except Exception as error:
                 self.logger.error(f"Error in {func.__name__}: {error}")
-                await asyncio.sleep(random.randint(delay, delay * 2))
+                await clock.sleep(random.randint(delay, delay * 2))
                 raise
 
         return wrapper
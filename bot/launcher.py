@@ -1,17 +1,16 @@
 import asyncio
 import random
 from argparse import ArgumentParser
-from itertools import cycle
 from pathlib import Path
-from typing import NamedTuple
-
-from better_proxy import Proxy
-from pyrogram import Client
+from typing import TYPE_CHECKING, NamedTuple
 
 from bot.config.logger import log
-from bot.config.settings import config, logo
-from bot.core.bot import run_bot
-from bot.utils import get_session_profiles
+from bot.config.settings import LaunchMode, SessionStorage, config, logo
+
+# Pyrogram, aiohttp and the bot core are imported inside the functions that need them,
+# so the menu and session registration start without loading the whole stack.
+if TYPE_CHECKING:
+    from pyrogram import Client
 
 start_text = """
     Select an action:
@@ -21,11 +20,15 @@ start_text = """
 
 
 class SessionData(NamedTuple):
-    tg_client: Client
+    session_name: str
     session_data: dict
 
 
 def get_session_names() -> list[str]:
+    if config.SESSION_STORAGE == SessionStorage.database:
+        from bot.core.session_storage import get_session_database
+
+        return get_session_database().names()
     return [file.stem for file in sorted(Path("sessions").glob("*.session"))]
 
 
@@ -38,12 +41,7 @@ async def register_sessions() -> None:
     if not sessions_path.exists():
         sessions_path.mkdir()
 
-    session = Client(
-        name=session_name,
-        api_id=config.API_ID,
-        api_hash=config.API_HASH,
-        workdir="sessions/",
-    )
+    session = make_tg_client(session_name)
 
     async with session:
         user_data = await session.get_me()
@@ -55,53 +53,113 @@ async def register_sessions() -> None:
 
 def get_proxies() -> [str | None]:
     if config.USE_PROXY_FROM_FILE:
-        with Path("proxies.txt").open(encoding="utf-8") as file:
-            return [Proxy.from_str(proxy=row.strip()).as_url for row in file if row.strip()]
+        from bot.core.proxy_pool import read_proxies
+
+        return read_proxies()
     return None
 
 
-async def get_tg_clients() -> list[SessionData]:
+def count_proxies() -> int:
+    if not config.USE_PROXY_FROM_FILE:
+        return 0
+    with Path("proxies.txt").open(encoding="utf-8") as file:
+        return sum(1 for row in file if row.strip())
+
+
+def make_tg_client(session_name: str) -> "Client":
+    from pyrogram import Client
+
+    if config.SESSION_STORAGE == SessionStorage.database:
+        from bot.core.session_storage import DatabaseStorage, get_session_database
+
+        client = Client(name=session_name, api_id=config.API_ID, api_hash=config.API_HASH, in_memory=True)
+        client.storage = DatabaseStorage(session_name, get_session_database())
+        return client
+    return Client(
+        name=session_name,
+        api_id=config.API_ID,
+        api_hash=config.API_HASH,
+        workdir="sessions/",
+    )
+
+
+def get_sessions() -> list[SessionData]:
+    from bot.utils import get_session_profiles
+
     session_names = get_session_names()
 
     if not session_names:
-        msg = "Not found session files"
+        msg = "Not found sessions"
         raise FileNotFoundError(msg)
     session_profiles = get_session_profiles(session_names)
     return [
-        SessionData(
-            tg_client=Client(
-                name=session_name,
-                api_id=config.API_ID,
-                api_hash=config.API_HASH,
-                workdir="sessions/",
-            ),
-            session_data=session_profiles[session_name],
-        )
+        SessionData(session_name=session_name, session_data=session_profiles[session_name])
         for session_name in session_names
     ]
 
 
-async def run_bot_with_delay(tg_client: Client, proxy: str | None, additional_data: dict, session_index: int) -> None:
-    delay = session_index * config.SESSION_AC_DELAY + random.randint(*config.SLEEP_BETWEEN_START)
-    log.bind(session_name=tg_client.name).info(f"Wait {delay} seconds before start")
-    await asyncio.sleep(delay)
-    await run_bot(tg_client=tg_client, proxy=proxy, additional_data=additional_data)
+async def run_bot_with_delay(session: SessionData, proxy: str | None, session_index: int) -> None:
+    from bot.core import clock
+    from bot.core.bot import run_bot
 
-
-async def run_clients(session_data: list[SessionData]) -> None:
+    delay = session_index * config.SESSION_AC_DELAY + random.randint(*config.SLEEP_BETWEEN_START)
+    log.bind(session_name=session.session_name).info(f"Wait {delay} seconds before start")
+    await clock.sleep(delay)
+    await run_bot(tg_client=make_tg_client(session.session_name), proxy=proxy, additional_data=session.session_data)
+
+
+async def run_bots_with_ramp(sessions: list[SessionData]) -> None:
+    from bot.core import clock
+    from bot.core.bot import run_bot
+    from bot.core.concurrency import startup_ramp
+    from bot.core.proxy_pool import proxy_pool
+
+    tasks = []
+    for session in sessions:
+        tasks.append(
+            asyncio.create_task(
+                run_bot(
+                    tg_client=make_tg_client(session.session_name),
+                    proxy=proxy_pool.acquire(session.session_name),
+                    additional_data=session.session_data,
+                )
+            )
+        )
+        delay = startup_ramp.next_delay()
+        log.info(f"Started <c>{len(tasks)}/{len(sessions)}</c> sessions | Next start in {delay:.1f} seconds")
+        await clock.sleep(delay)
+    await asyncio.gather(*tasks)
+
+
+async def run_clients(sessions: list[SessionData], profile_seconds: int | None = None) -> None:
+    from bot.core.journal import journal
+    from bot.core.loop_monitor import loop_monitor
+    from bot.core.memory import memory_reporter
+    from bot.core.metrics import cycle_metrics
+    from bot.core.proxy_pool import proxy_pool
+    from bot.core.sampler import stack_sampler
+
+    journal.start()
+    cycle_metrics.start()
+    loop_monitor.start()
+    stack_sampler.install_signal_handler(config.PROFILE_SECONDS)
+    memory_reporter.install_signal_handler()
+    if profile_seconds:
+        stack_sampler.start(profile_seconds)
     proxies = get_proxies() or [None]
     if config.ADD_LOCAL_MACHINE_AS_IP:
         proxies.append(None)
-    proxy_cycle = cycle(proxies)
+    proxy_pool.load(proxies)
+    if proxy_pool:
+        await proxy_pool.probe_all()
+        proxy_pool.start_monitor()
+    if config.LAUNCH_MODE == LaunchMode.ramp:
+        await run_bots_with_ramp(sessions)
+        return
     await asyncio.gather(
         *[
-            run_bot_with_delay(
-                tg_client=s_data.tg_client,
-                proxy=next(proxy_cycle),
-                additional_data=s_data.session_data,
-                session_index=index,
-            )
-            for index, s_data in enumerate(session_data)
+            run_bot_with_delay(session=session, proxy=proxy_pool.acquire(session.session_name), session_index=index)
+            for index, session in enumerate(sessions)
         ]
     )
 
@@ -110,8 +168,15 @@ async def start() -> None:
     print(logo)
     parser = ArgumentParser()
     parser.add_argument("-a", "--action", type=int, choices=[1, 2], help="Action to perform  (1 or 2)")
-    log.info(f"Detected {len(get_session_names())} sessions | {len(proxy) if (proxy := get_proxies()) else 0} proxies")
-    action = parser.parse_args().action
+    parser.add_argument("--profile", type=int, metavar="SECONDS", help="Sample the event loop for SECONDS after start")
+    parser.add_argument("--trace-memory", action="store_true", help="Trace allocations for SIGUSR2 memory reports")
+    log.info(f"Detected {len(get_session_names())} sessions | {count_proxies()} proxies")
+    args = parser.parse_args()
+    action = args.action
+    if args.trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
 
     if not action:
         print(start_text)
@@ -125,5 +190,4 @@ async def start() -> None:
     if action == 1:
         await register_sessions()
     elif action == 2:
-        session_data = await get_tg_clients()
-        await run_clients(session_data=session_data)
+        await run_clients(sessions=get_sessions(), profile_seconds=args.profile)
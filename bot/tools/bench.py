@@ -0,0 +1,268 @@
+"""Micro-benchmarks for the CPU hot paths, with JSON baselines.
+
+    python -m bot.tools.bench                                     # run everything, print a table
+    python -m bot.tools.bench --filter calculator --output bench-before.json
+    python -m bot.tools.bench --baseline bench-before.json        # run and flag regressions
+    python -m bot.tools.bench --compare bench-before.json bench-after.json --threshold 0.05
+
+Inputs are fixed: the skill catalog in bot/tools/fixtures/skills.json and the hero in
+bot/tools/fixtures/hero.json. The catalog is repeated up to ``--skills`` entries to get a
+user/data/all-sized payload. Every benchmark is timed in ``--repeat`` rounds of enough loops to
+run ``--min-time`` seconds; the median and the best time per operation are reported. Comparisons
+exit with status 1 when a median is slower than the baseline by more than ``--threshold``.
+"""
+
+import asyncio
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+
+from bot.config.settings import config
+from bot.core.api_js_helpers.bet_counter import BetCounter
+from bot.core.api_js_helpers.upgrader import Calculator
+from bot.core.bot import CryptoBot
+from bot.core.models import DbSkill, DbSkills, ProfileData, UserDataAfter
+from bot.helper.utils import handle_request
+from bot.tools.loadtest import git_version
+
+FIXTURES = Path(__file__).parent / "fixtures"
+PRICE_FORMULAS = ("fnLinear", "fnQuadratic", "fnCubic", "fnExponential", "fnLogarithmic", "fnCompound")
+# fnPayback sums the prices of the previous levels, it only works as a profit formula
+PROFIT_FORMULAS = (*PRICE_FORMULAS, "fnPayback")
+LEVELS = (1, 5, 10, 20, 30)
+
+
+def load_fixtures(skills: int) -> tuple[dict, dict]:
+    """The user/data/all payload with ``skills`` catalog entries and the user/data/after payload."""
+    catalog = json.loads((FIXTURES / "skills.json").read_text(encoding="utf-8"))["dbSkills"]
+    hero = json.loads((FIXTURES / "hero.json").read_text(encoding="utf-8"))
+    db_skills = [
+        {**skill, "key": skill["key"] if number < len(catalog) else f"{skill['key']}_{number // len(catalog)}"}
+        for number, skill in ((number, catalog[number % len(catalog)]) for number in range(skills))
+    ]
+    db_quests = [
+        {"key": f"quest_{number}", "title": f"Quest {number}", "requiredLevel": 1, "actionUrl": "", "rewardMoney": 1000}
+        for number in range(60)
+    ]
+    data_all = {
+        "profile": hero["profile"],
+        "hero": hero["hero"],
+        "dbData": {"dbSkills": db_skills, "dbQuests": db_quests, "dbNegotiationsLeague": []},
+    }
+    return data_all, hero["after"]
+
+
+def formula_skills(catalog: list[dict]) -> dict[str, DbSkill]:
+    """One catalog skill per profit formula (and price formula where valid), so every branch of Calculator is timed."""
+    skill = catalog[0]
+    return {
+        formula: DbSkill(
+            **{
+                **skill,
+                "priceFormula": formula if formula in PRICE_FORMULAS else skill["priceFormula"],
+                "profitFormula": formula,
+                "profitFormulaK": 10,
+            }
+        )
+        for formula in PROFIT_FORMULAS
+    }
+
+
+class CannedResponse:
+    """What handle_request reads from an aiohttp response, decoded from a fixed body."""
+
+    headers = {"Content-Type": "application/json"}
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+    def raise_for_status(self) -> None:
+        pass
+
+    async def json(self) -> dict:
+        return json.loads(self.body)
+
+
+class CannedClient:
+    """Encodes the request body like aiohttp and answers with a fixed response."""
+
+    def __init__(self, body: bytes) -> None:
+        self.response = CannedResponse(body)
+
+    async def post(self, url: str, **kwargs) -> CannedResponse:
+        json.dumps(kwargs["json"]).encode()
+        return self.response
+
+
+class RequestTarget:
+    api_url = ""
+
+    def __init__(self, body: bytes) -> None:
+        self.http_client = CannedClient(body)
+
+    def observe_request(self, endpoint: str, elapsed: float, ok: bool) -> None:
+        pass
+
+    @handle_request("/user/data/all")
+    async def data_all(self, *, response_json: dict, json_body: dict) -> dict:
+        return response_json
+
+
+def build_benchmarks(skills: int) -> dict[str, Callable[[int], None]]:
+    """Benchmark name -> function running the operation the given number of times."""
+    data_all, data_after = load_fixtures(skills)
+    by_formula = formula_skills(data_all["dbData"]["dbSkills"])
+    calculator = Calculator()
+    benchmarks = {}
+
+    for formula, skill in by_formula.items():
+
+        def price(loops: int, skill: DbSkill = skill) -> None:
+            for _ in range(loops):
+                for level in LEVELS:
+                    calculator.get_price(skill, level)
+
+        def profit(loops: int, skill: DbSkill = skill) -> None:
+            for _ in range(loops):
+                for level in LEVELS:
+                    calculator.get_profit(skill, level)
+
+        if formula in PRICE_FORMULAS:
+            benchmarks[f"calculator.get_price[{formula}]"] = price
+        benchmarks[f"calculator.get_profit[{formula}]"] = profit
+
+    hero = data_all["hero"]
+    bet_counter = BetCounter(SimpleNamespace(level=hero["level"], mph=hero["moneyPerHour"], balance=hero["money"]))
+
+    def calculate_bet(loops: int) -> None:
+        for _ in range(loops):
+            bet_counter.calculate_bet()
+
+    def db_skills(loops: int) -> None:
+        for _ in range(loops):
+            DbSkills(**data_all["dbData"])
+
+    def profile_data(loops: int) -> None:
+        for _ in range(loops):
+            ProfileData(**data_all)
+
+    def user_data_after(loops: int) -> None:
+        for _ in range(loops):
+            UserDataAfter(**data_after)
+
+    bot = CryptoBot(tg_client=SimpleNamespace(name="bench"), additional_data=[{"User-Agent": "bench"}])
+    bot.dbs = data_all["dbData"]
+    bot.data_after = UserDataAfter(**data_after)
+    bot.user_profile = ProfileData(**data_all)
+
+    def available_skills(loops: int) -> None:
+        for _ in range(loops):
+            list(bot._get_available_skills())
+
+    target = RequestTarget(json.dumps({"success": True, "data": data_all}).encode())
+    request_body = {"data": {"initData": "bench", "platform": "android", "chatType": "sender"}}
+
+    def request_overhead(loops: int) -> None:
+        async def run() -> None:
+            for _ in range(loops):
+                await target.data_all(json_body=request_body)
+
+        asyncio.run(run())
+
+    benchmarks.update(
+        {
+            "bet_counter.calculate_bet": calculate_bet,
+            "models.DbSkills": db_skills,
+            "models.ProfileData": profile_data,
+            "models.UserDataAfter": user_data_after,
+            "bot._get_available_skills": available_skills,
+            "handle_request[user/data/all]": request_overhead,
+        }
+    )
+    return benchmarks
+
+
+def measure(function: Callable[[int], None], min_time: float, repeat: int) -> dict:
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        function(loops)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.1))
+    times = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        function(loops)
+        times.append((time.perf_counter() - started) / loops)
+    return {"median_us": statistics.median(times) * 1e6, "best_us": min(times) * 1e6, "loops": loops}
+
+
+def compare(baseline: dict, result: dict, threshold: float) -> bool:
+    """Print the change of every benchmark present in both runs, return False on a regression."""
+    print(f"\nCompared with {baseline['version']}:")
+    ok = True
+    for name, new in result["results"].items():
+        if (old := baseline["results"].get(name)) is None:
+            continue
+        change = (new["median_us"] - old["median_us"]) / old["median_us"]
+        flag = ""
+        if change > threshold:
+            flag, ok = "  REGRESSION", False
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"  {name:<38} {old['median_us']:>10.2f} -> {new['median_us']:<10.2f} us {change:+7.1%}{flag}")
+    return ok
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Time the CPU hot paths against fixed fixtures")
+    parser.add_argument("--filter", help="Regular expression for benchmark names")
+    parser.add_argument("--skills", type=int, default=150, help="Catalog size of the user/data/all payload")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing round")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Save the results as a JSON baseline")
+    parser.add_argument("--baseline", type=Path, help="Compare this run with a saved baseline")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"), help="Compare two saved runs")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        old, new = (json.loads(path.read_text(encoding="utf-8")) for path in args.compare)
+        sys.exit(0 if compare(old, new, args.threshold) else 1)
+
+    config.JOURNAL_ENABLED = False
+    config.LEDGER_ENABLED = False
+    pattern = re.compile(args.filter) if args.filter else None
+    results = {}
+    for name, function in build_benchmarks(args.skills).items():
+        if pattern and not pattern.search(name):
+            continue
+        results[name] = measure(function, args.min_time, args.repeat)
+        print(f"{name:<40} {results[name]['median_us']:>10.2f} us  (best {results[name]['best_us']:.2f})")
+
+    result = {
+        "version": git_version(),
+        "time": time.time(),
+        "python": platform.python_version(),
+        "skills": args.skills,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Saved to {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        sys.exit(0 if compare(baseline, result, args.threshold) else 1)
+
+
+if __name__ == "__main__":
+    main()
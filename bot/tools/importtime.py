@@ -0,0 +1,85 @@
+"""Import-time budget for the entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a clean interpreter, prints the slowest
+imports and exits with a non-zero status when a module is over budget or pulls in a dependency
+that belongs to another code path. API_ID and API_HASH get dummy values when they are not set,
+the settings need them at import. tests/test_importtime.py runs the same budgets under pytest,
+IMPORT_BUDGET_SCALE scales them there.
+
+    python -m bot.tools.importtime
+    python -m bot.tools.importtime --top 30 --scale 2
+"""
+
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from typing import NamedTuple
+
+
+class ImportBudget(NamedTuple):
+    module: str
+    budget_ms: int
+    forbidden: tuple[str, ...] = ()
+
+
+class ImportRecord(NamedTuple):
+    name: str
+    self_us: int
+    cumulative_us: int
+
+
+BUDGETS = (
+    ImportBudget("main", 400, forbidden=("pyrogram", "aiohttp", "fake_useragent", "better_proxy")),
+    ImportBudget("bot.launcher", 400, forbidden=("pyrogram", "aiohttp", "fake_useragent", "better_proxy")),
+    ImportBudget("bot.utils", 50, forbidden=("fake_useragent",)),
+)
+
+
+def measure(module: str) -> list[ImportRecord]:
+    env = {"API_ID": "1", "API_HASH": "importtime", **os.environ}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def check(budget: ImportBudget, scale: float, top: int) -> list[str]:
+    records = measure(budget.module)
+    total_ms = next(r.cumulative_us for r in reversed(records) if r.name == budget.module) / 1000
+    print(f"{budget.module}: {total_ms:.1f} ms (budget {budget.budget_ms * scale:.0f} ms)")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(f"    {record.self_us / 1000:8.1f} ms  {record.name}")
+
+    problems = []
+    if total_ms > budget.budget_ms * scale:
+        problems.append(f"{budget.module} takes {total_ms:.1f} ms to import")
+    imported = {record.name.split(".")[0] for record in records}
+    problems += [f"{budget.module} imports {name}" for name in budget.forbidden if name in imported]
+    return problems
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Check import time of the bot entry points")
+    parser.add_argument("--top", type=int, default=10, help="Show the slowest N imports per module")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply budgets, for slow machines or CI")
+    args = parser.parse_args()
+
+    problems = [problem for budget in BUDGETS for problem in check(budget, args.scale, args.top)]
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
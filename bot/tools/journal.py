@@ -0,0 +1,80 @@
+"""Query the action journal.
+
+python -m bot.tools.journal                              # totals per session and kind
+python -m bot.tools.journal --kind upgrade --group-by day
+python -m bot.tools.journal --session my_account --since 2024-08-01 --events 20
+"""
+
+import sqlite3
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+
+GROUPS = {
+    "session": "session",
+    "kind": "kind",
+    "day": "date(time, 'unixepoch')",
+    "key": "key",
+}
+
+
+def build_filters(session: str | None, kind: str | None, since: str | None) -> tuple[str, list]:
+    clauses, params = [], []
+    if session:
+        clauses.append("session = ?")
+        params.append(session)
+    if kind:
+        clauses.append("kind = ?")
+        params.append(kind)
+    if since:
+        clauses.append("time >= ?")
+        since_time = datetime.fromisoformat(since)
+        if since_time.tzinfo is None:
+            since_time = since_time.replace(tzinfo=timezone.utc)
+        params.append(since_time.timestamp())
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def print_table(header: list[str], rows: list[tuple]) -> None:
+    rows = [tuple("" if value is None else str(value) for value in row) for row in rows]
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    for row in [header, *rows]:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Query the bot action journal")
+    parser.add_argument("--db", default="journal.sqlite3")
+    parser.add_argument("--session")
+    parser.add_argument("--kind", help="upgrade, taps, invest, box, pvp, quest, daily_quest, daily_reward, friend, ...")
+    parser.add_argument("--since", help="ISO date or datetime in UTC unless an offset is given, e.g. 2024-08-01")
+    parser.add_argument("--group-by", nargs="+", choices=GROUPS, default=["session", "kind"])
+    parser.add_argument("--events", type=int, help="Print the latest N events instead of totals")
+    args = parser.parse_args()
+
+    connection = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    where, params = build_filters(args.session, args.kind, args.since)
+    if args.events:
+        query = (
+            "SELECT datetime(time, 'unixepoch'), session, kind, key, money, profit, data FROM events"
+            f"{where} ORDER BY time DESC LIMIT ?"
+        )
+        print_table(
+            ["time", "session", "kind", "key", "money", "profit", "data"],
+            connection.execute(query, [*params, args.events]).fetchall(),
+        )
+        return
+
+    columns = ", ".join(GROUPS[group] for group in args.group_by)
+    query = (
+        f"SELECT {columns}, count(*), sum(money), sum(profit) FROM events{where} "
+        f"GROUP BY {columns} ORDER BY {columns}"
+    )
+    print_table([*args.group_by, "events", "money", "profit"], connection.execute(query, params).fetchall())
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except sqlite3.OperationalError as error:
+        sys.exit(f"Journal is not readable: {error}")
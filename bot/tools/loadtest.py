@@ -0,0 +1,429 @@
+"""End-to-end load test: many bot sessions against a local stand-in of the game API.
+
+    python -m bot.tools.loadtest --sessions 500 --cycles 3
+    python -m bot.tools.loadtest --sessions 200 --days 7
+    python -m bot.tools.loadtest --sessions 2000 --output after.json --baseline before.json
+
+Telegram auth is stubbed and the bot runs on a FastForwardClock, so its sleeps end as soon as
+nothing else is left to run and days of cycles pass in minutes. Every request carries the bot's
+clock, which the stand-in server uses for energy, income and daily resets. Nothing leaves
+127.0.0.1. Results are written as JSON for comparing runs across versions.
+"""
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+from aiohttp import web
+from loguru import logger
+from pytz import UTC
+
+from bot.config.headers import headers
+from bot.config.settings import config
+from bot.core import clock
+from bot.core.api import TgWebData
+from bot.core.bot import CryptoBot
+from bot.core.concurrency import cycle_limiter
+from bot.core.journal import journal
+from bot.core.ledger import ledger
+from bot.core.loop_monitor import loop_monitor
+from bot.core.metrics import cycle_metrics, percentile
+from bot.core.models import DbSkills
+from bot.core.reference_cache import reference_cache
+
+FIXTURE = Path(__file__).parent / "fixtures" / "skills.json"
+YOUTUBE_TITLE = "How the stand-in server works"
+CLOCK_HEADER = "X-Loadtest-Time"
+COMPARED = ("requests_per_second", "cpu_ms_per_session_cycle", "rss_kb_per_session", "latency_p50", "latency_p99")
+
+
+class Account:
+    def __init__(self, user_id: int, now: float) -> None:
+        self.user_id = user_id
+        self.hero = {
+            "id": user_id,
+            "level": 5,
+            "money": 5_000_000,
+            "moneyPerHour": 20_000,
+            "offlineBonus": 0,
+            "earns": {"task": {"moneyPerTap": 5, "limit": 3000, "energy": 3000, "recoveryPerSecond": 3}},
+        }
+        self.skills: dict[str, dict] = {}
+        self.quests: dict[str, bool] = {}
+        self.funds: list[dict] = []
+        self.day = -1
+        self.updated_at = now
+
+    def advance(self, now: float) -> None:
+        elapsed, self.updated_at = now - self.updated_at, now
+        self.hero["money"] += int(self.hero["moneyPerHour"] * elapsed / 3600)
+        task = self.hero["earns"]["task"]
+        task["energy"] = min(task["limit"], task["energy"] + task["recoveryPerSecond"] * elapsed)
+        if (day := int(now // 86400)) != self.day:
+            self.day, self.funds = day, []
+            self.daily_claimed = self.youtube_claimed = self.friend_claimed = False
+            self.boxes = 1
+
+
+class StandInServer:
+    """Answers the game API endpoints the bot calls, keeping one hero per Api-Key."""
+
+    def __init__(self, catalog: dict, latency: float) -> None:
+        self.skills = {skill.key: skill for skill in DbSkills(**catalog).dbSkills}
+        self.db_data = {
+            **catalog,
+            "dbQuests": [
+                {
+                    "key": f"riddle_{number}",
+                    "title": f"Riddle {number}",
+                    "requiredLevel": 1,
+                    "actionUrl": "",
+                    "checkType": "checkCode",
+                    "checkData": "answer",
+                    "rewardMoney": 10_000,
+                }
+                for number in range(3)
+            ],
+            "dbNegotiationsLeague": [],
+            "dbNegotiationsStrategy": [],
+        }
+        self.latency = latency
+        self.accounts: dict[str, Account] = {}
+        self.routes = {
+            "/telegram/auth": self.auth,
+            "/user/data/all": self.data_all,
+            "/user/data/after": self.data_after,
+            "/hero/balance/sync": self.hero_only,
+            "/hero/bonus/offline/claim": self.hero_only,
+            "/billing/balance": self.empty,
+            "/purchase/list": self.empty,
+            "/avatar/generated/all": self.empty,
+            "/box/list": self.box_list,
+            "/box/open": self.box_open,
+            "/quests/daily/claim": self.daily_claim,
+            "/quests/daily/progress/all": self.daily_quests,
+            "/quests/daily/progress/claim": self.daily_quest_claim,
+            "/quests/check": self.quest_check,
+            "/quests/claim": self.quest_claim,
+            "/friends/claim": self.friend_claim,
+            "/hero/tap/action": self.taps,
+            "/fund/info": self.fund_info,
+            "/fund/invest": self.invest,
+            "/skills/improve": self.skill_improve,
+        }
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/helper.json", self.helper)
+        app.router.add_post("/{path:.*}", self.dispatch)
+        return app
+
+    async def dispatch(self, request: web.Request) -> web.Response:
+        if (handler := self.routes.get("/" + request.match_info["path"])) is None:
+            raise web.HTTPNotFound()
+        key = request.headers.get("Api-Key", "")
+        now = self.now(request)
+        if (account := self.accounts.get(key)) is None:
+            account = self.accounts[key] = Account(len(self.accounts) + 1, now)
+        account.advance(now)
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        return web.json_response(handler(account, body.get("data")))
+
+    @staticmethod
+    def now(request: web.Request) -> float:
+        return float(request.headers.get(CLOCK_HEADER, time.time()))
+
+    async def helper(self, request: web.Request) -> web.Response:
+        today = str(datetime.fromtimestamp(self.now(request), UTC).date())
+        body = json.dumps({"youtube": {YOUTUBE_TITLE: 1234}, today: {"funds": ["fund_a", "fund_b"]}})
+        etag = f'"{today}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(text=body, content_type="application/json", headers={"ETag": etag})
+
+    @staticmethod
+    def with_hero(account: Account, **data) -> dict:
+        return {"success": True, "data": {"hero": account.hero, **data}}
+
+    def auth(self, account: Account, data: dict) -> dict:
+        return {"success": True}
+
+    def data_all(self, account: Account, data: dict) -> dict:
+        profile = {"id": account.user_id}
+        return {"success": True, "data": {"profile": profile, "hero": account.hero, "dbData": self.db_data}}
+
+    def data_after(self, account: Account, data: dict) -> dict:
+        return {
+            "success": True,
+            "data": {
+                "dailyRewards": {"1": "taken" if account.daily_claimed else "canTake"},
+                "quests": [{"key": key, "isRewarded": rewarded} for key, rewarded in account.quests.items()],
+                "friends": [{"id": 1, "name": "friend", "bonusToTake": 0 if account.friend_claimed else 5000}],
+                "skills": account.skills,
+            },
+        }
+
+    def hero_only(self, account: Account, data: dict) -> dict:
+        return self.with_hero(account)
+
+    def empty(self, account: Account, data: dict) -> dict:
+        return {"success": True, "data": {}}
+
+    def box_list(self, account: Account, data: dict) -> dict:
+        return {"success": True, "data": {"box_small": account.boxes} if account.boxes else {}}
+
+    def box_open(self, account: Account, data: dict) -> dict:
+        account.boxes = max(account.boxes - 1, 0)
+        account.hero["money"] += 1000
+        return {"success": True, "data": {"loot": [{"type": "money", "value": 1000}]}}
+
+    def daily_claim(self, account: Account, data: dict) -> dict:
+        account.daily_claimed = True
+        account.hero["money"] += 5000
+        return self.with_hero(account)
+
+    def daily_quests(self, account: Account, data: dict) -> dict:
+        quest = {"type": "youtube", "isRewarded": account.youtube_claimed, "description": YOUTUBE_TITLE}
+        return {"success": True, "data": {"youtube_1": quest}}
+
+    def daily_quest_claim(self, account: Account, data: dict) -> dict:
+        account.youtube_claimed = True
+        return self.with_hero(account)
+
+    def quest_check(self, account: Account, data: list) -> dict:
+        account.quests.setdefault(data[0], False)
+        return self.with_hero(account)
+
+    def quest_claim(self, account: Account, data: list) -> dict:
+        if account.quests.get(data[0]) is False:
+            account.quests[data[0]] = True
+            account.hero["money"] += 10_000
+        return self.with_hero(account)
+
+    def friend_claim(self, account: Account, data: int) -> dict:
+        if not account.friend_claimed:
+            account.friend_claimed = True
+            account.hero["money"] += 5000
+        return self.with_hero(account)
+
+    def taps(self, account: Account, data: dict) -> dict:
+        task = data["data"]["task"]
+        account.hero["money"] += int(task["amount"])
+        account.hero["earns"]["task"]["energy"] = int(task["currentEnergy"])
+        return self.with_hero(account, tappedToday=int(task["amount"]))
+
+    def fund_info(self, account: Account, data: dict) -> dict:
+        return {"success": True, "data": {"funds": account.funds}}
+
+    def invest(self, account: Account, data: dict) -> dict:
+        money = int(data["money"])
+        account.hero["money"] -= money
+        account.funds.append({"fundKey": data["fund"], "moneyProfit": random.choice((-money, money))})
+        return self.with_hero(account, funds=account.funds)
+
+    def skill_improve(self, account: Account, data: str) -> dict:
+        skill = self.skills[data]
+        level = account.skills.get(data, {}).get("level", 0) + 1
+        account.hero["money"] -= skill.price_for_level(level)
+        account.hero["moneyPerHour"] += skill.calculate_profit(level) - skill.calculate_profit(level - 1)
+        account.skills[data] = {"level": level, "lastUpgradeDate": None, "finishUpgradeDate": None}
+        return self.with_hero(account)
+
+
+def serve(port: int, catalog_path: Path, latency: float) -> None:
+    catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+    web.run_app(StandInServer(catalog, latency).app(), host="127.0.0.1", port=port, print=None)
+
+
+latencies: list[float] = []
+
+
+class LoadTestBot(CryptoBot):
+    """CryptoBot with Telegram auth stubbed."""
+
+    async def get_tg_web_data(self, proxy: str | None) -> TgWebData:
+        return TgWebData(hash=self.session_name, request_data={"data": {"initData": self.session_name}})
+
+    def observe_request(self, endpoint: str, elapsed: float, ok: bool) -> None:
+        super().observe_request(endpoint, elapsed, ok)
+        latencies.append(elapsed)
+
+
+async def send_clock(session: aiohttp.ClientSession, context, params: aiohttp.TraceRequestStartParams) -> None:
+    params.headers[CLOCK_HEADER] = str(clock.timestamp())
+
+
+async def run_session(bot: LoadTestBot, cycles: int, days: float, start_delay: float) -> tuple[int, int]:
+    """Run the bot's cycles like CryptoBot._run_cycles, ``days`` of clock time when set, else ``cycles`` cycles.
+
+    Returns the number of completed and of started cycles.
+    """
+    await clock.sleep(start_delay)
+    completed = 0
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(send_clock)
+    async with aiohttp.ClientSession(
+        headers=headers, timeout=aiohttp.ClientTimeout(total=60), trace_configs=[trace_config]
+    ) as http_client:
+        bot.http_client = http_client
+        for cycle in itertools.count():
+            if (clock.monotonic() >= days * 86400) if days else (cycle >= cycles):
+                return completed, cycle
+            try:
+                async with cycle_limiter:
+                    bot.pacer.start_cycle()
+                    profile = await bot.run_cycle(None)
+                    bot.pacer.finish_cycle()
+                async with bot.stage("wait"):
+                    await bot.sleep_until_next_cycle(profile)
+                completed += 1
+            except Exception:
+                bot.errors += 1
+                bot.logger.exception("Cycle failed")
+            bot.authorized = False
+
+
+def peak_rss_kb() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+async def run_load(sessions: int, cycles: int, days: float, ramp: float) -> dict:
+    loop_monitor.start()
+    rss_before = peak_rss_kb()
+    bots = [
+        LoadTestBot(tg_client=SimpleNamespace(name=f"load_{number}"), additional_data=[{"User-Agent": "loadtest"}])
+        for number in range(sessions)
+    ]
+    cpu_started, started = time.process_time(), time.perf_counter()
+    counts = await asyncio.gather(*(run_session(bot, cycles, days, random.uniform(0, ramp)) for bot in bots))
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    session_cycles = sum(completed for completed, _ in counts)
+    return {
+        "sessions": sessions,
+        "session_cycles": session_cycles,
+        "failed_cycles": sum(started for _, started in counts) - session_cycles,
+        "simulated_days": clock.monotonic() / 86400,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / wall,
+        "cpu_ms_per_session_cycle": cpu * 1000 / max(session_cycles, 1),
+        "rss_kb_per_session": (peak_rss_kb() - rss_before) / sessions,
+        "peak_rss_kb": peak_rss_kb(),
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p99": percentile(latencies, 0.99),
+        "loop_lag": loop_monitor.summary(),
+        "stages": cycle_metrics.snapshot()["stages"],
+    }
+
+
+def git_version() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    sys.exit("Stand-in server did not start")
+
+
+def compare(result: dict, baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    print(f"\nCompared with {baseline['version']} ({baseline_path}):")
+    for name in COMPARED:
+        old, new = baseline["results"][name], result["results"][name]
+        change = f"{(new - old) / old:+.1%}" if old else "n/a"
+        print(f"  {name:<26} {old:>12.4g} -> {new:<12.4g} {change}")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Run bot sessions against a local stand-in of the game API")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=3, help="Cycles per session")
+    parser.add_argument("--days", type=float, default=0, help="Run cycles for this many days instead of --cycles")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server response delay, seconds")
+    parser.add_argument("--ramp", type=float, default=0, help="Spread session starts over this many clock seconds")
+    parser.add_argument(
+        "--io-grace", type=float, default=0, help="Real seconds given to pending requests before the clock jumps"
+    )
+    parser.add_argument("--catalog", type=Path, default=FIXTURE, help="dbData or dbSkills JSON")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--output", type=Path, default=Path(f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json"))
+    parser.add_argument("--baseline", type=Path, help="Earlier result to compare with")
+    args = parser.parse_args()
+
+    port = free_port()
+    server = multiprocessing.Process(
+        target=serve, args=(port, args.catalog, args.latency), name="stand-in-server", daemon=True
+    )
+    server.start()
+    wait_for_port(port)
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    journal.path = workdir / "journal.sqlite3"
+    ledger.path = workdir / "ledger.sqlite3"
+    reference_cache.directory = workdir / "reference"
+    config.base_url = config.auth_url = f"http://127.0.0.1:{port}"
+    config.HELPER_URL = f"http://127.0.0.1:{port}/helper.json"
+    clock.use(clock.FastForwardClock(io_grace=args.io_grace))
+
+    try:
+        results = asyncio.run(run_load(args.sessions, args.cycles, args.days, args.ramp))
+    finally:
+        server.terminate()
+        clock.use(clock.Clock())
+    journal.flush()
+    result = {
+        "version": git_version(),
+        "time": time.time(),
+        "python": sys.version.split()[0],
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+        "results": results,
+    }
+    args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    summary = ("sessions", "session_cycles", "simulated_days", *COMPARED)
+    print(json.dumps({name: results[name] for name in summary}, indent=2))
+    print(f"Loop lag: {results['loop_lag']}")
+    print(f"Saved to {args.output}")
+    if args.baseline:
+        compare(result, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
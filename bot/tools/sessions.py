@@ -0,0 +1,69 @@
+"""Move Pyrogram sessions between sessions/*.session files and sessions.sqlite3.
+
+    python -m bot.tools.sessions import                      # every sessions/*.session into sessions.sqlite3
+    python -m bot.tools.sessions import --dir old_sessions my_account other_account
+    python -m bot.tools.sessions export --dir backup         # every stored session back to backup/*.session
+    python -m bot.tools.sessions list
+
+Set SESSION_STORAGE=database after importing to run the bot from the database.
+"""
+
+import asyncio
+import sys
+from argparse import ArgumentParser
+from datetime import datetime
+from pathlib import Path
+
+from bot.core.session_storage import SessionDatabase, export_session_file, import_session_file
+
+
+async def import_sessions(database: SessionDatabase, directory: Path, names: list[str]) -> None:
+    paths = [directory / f"{name}.session" for name in names] or sorted(directory.glob("*.session"))
+    if missing := [str(path) for path in paths if not path.is_file()]:
+        sys.exit(f"Session files not found: {', '.join(missing)}")
+    for path in paths:
+        await import_session_file(path, database)
+        print(f"imported {path}")
+    print(f"{len(paths)} sessions imported into {database.path}")
+
+
+async def export_sessions(database: SessionDatabase, directory: Path, names: list[str]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    names = names or database.names()
+    for name in names:
+        print(f"exported {await export_session_file(name, database, directory)}")
+    print(f"{len(names)} sessions exported to {directory}")
+
+
+def list_sessions(database: SessionDatabase) -> None:
+    for name in database.names():
+        fields, peers = database.load(name)
+        saved = datetime.fromtimestamp(fields["date"]).strftime("%Y-%m-%d %H:%M") if fields["date"] else "-"
+        print(f"{name:<24} user {fields['user_id']}  dc {fields['dc_id']}  peers {len(peers):<5} saved {saved}")
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Import and export Pyrogram sessions")
+    parser.add_argument("command", choices=["import", "export", "list"])
+    parser.add_argument("names", nargs="*", help="Session names, all sessions by default")
+    parser.add_argument("--db", default="sessions.sqlite3")
+    parser.add_argument("--dir", type=Path, default=Path("sessions"), help="Directory with .session files")
+    args = parser.parse_args()
+
+    database = SessionDatabase(args.db)
+    try:
+        if args.command == "import":
+            asyncio.run(import_sessions(database, args.dir, args.names))
+        elif args.command == "export":
+            asyncio.run(export_sessions(database, args.dir, args.names))
+        else:
+            list_sessions(database)
+    finally:
+        database.close()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyError as error:
+        sys.exit(f"Session not found in the database: {error}")
@@ -0,0 +1,384 @@
+"""Offline economy simulator for the upgrade and tap settings.
+
+    python -m bot.tools.simulate                                     # default grid, 30 days
+    python -m bot.tools.simulate --grid SKILL_WEIGHT=0,0.02,0.05 --grid BOT_SLEEP_TIME=900,1800,3600
+    python -m bot.tools.simulate --catalog dbData.json --days 60 --seeds 20 --workers 8 --json result.json
+
+The catalog is the ``dbData`` object of the profile response (only ``dbSkills`` is read); a sample
+catalog ships in bot/tools/fixtures/skills.json. MONEY_TO_SAVE=bet keeps the bot's behaviour of
+saving the max PvP bet.
+
+The simulation is a plain Python event loop over the accounts (numpy is not a dependency of the
+bot), spread over a process pool; expect seconds per hundred scenarios. Which skills get upgraded
+is decided by the bot's own rules in bot.core.upgrades. The hero level and friend count stay at
+--hero-level and --friends for the whole run: the game's level-up rules are not known to the bot,
+so skills gated behind a higher level are never bought.
+"""
+
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from argparse import ArgumentParser
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from pathlib import Path
+from typing import NamedTuple
+
+from bot.config.settings import Settings, config
+from bot.core.api_js_helpers.bet_counter import BetCounter
+from bot.core.models import DbSkills
+from bot.core.upgrades import wants_hero_upgrade, wants_mining_upgrade
+
+FIXTURE = Path(__file__).parent / "fixtures" / "skills.json"
+TAP_EFFECTS = {"energy_capacity": "limit", "energy_recovery": "recovery", "profit_per_tap_power": "money_per_tap"}
+DEFAULT_GRID = {
+    "SKILL_WEIGHT": [0, 0.02, 0.04],
+    "MONEY_TO_SAVE": ["bet", 0, 1_000_000],
+    "MAX_MINING_UPGRADE_LEVEL": [10, 30, 60],
+    "MAX_MINING_UPGRADE_COSTS": [5_000_000],
+    "MAX_MINING_ENERGY_RECOVERY_UPGRADE_LEVEL": [60],
+    "TAPS_PER_SECOND": [10, 25],
+    "BOT_SLEEP_TIME": [900, 1700, 3600],
+}
+RESULT_COLUMNS = ("mph", "mph_min", "money", "upgrades")
+# grid settings read by the upgrade rules, the others are simulated here
+UPGRADE_SETTINGS = (
+    "SKILL_WEIGHT",
+    "MAX_MINING_UPGRADE_LEVEL",
+    "MAX_MINING_UPGRADE_COSTS",
+    "MAX_MINING_ENERGY_RECOVERY_UPGRADE_LEVEL",
+)
+
+
+class SkillTable(NamedTuple):
+    key: str
+    title: str
+    mining: bool
+    effect: str
+    max_level: int
+    prices: list[int]
+    profits: list[int]
+    requirements: list[tuple[int, int, dict]]
+
+
+class Start(NamedTuple):
+    money: int
+    level: int
+    friends: int
+    money_per_tap: int
+    limit: int
+    recovery: int
+
+
+def load_catalog(path: Path, level_cap: int) -> list[SkillTable]:
+    """Price, profit and requirements of every skill level, computed once with the bot's Calculator."""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    tables = []
+    for skill in DbSkills(**data.get("dbData", data)).dbSkills:
+        max_level = min(skill.maxLevel, level_cap)
+        levels = range(max_level + 2)
+        requirements = []
+        for level in levels:
+            required = skill.get_level_by_skill_level(level)
+            requirements.append(
+                (required.requiredHeroLevel, required.requiredFriends, required.requiredSkills or {})
+                if required
+                else (0, 0, {})
+            )
+        tables.append(
+            SkillTable(
+                key=skill.key,
+                title=skill.title,
+                mining=skill.category == "mining",
+                effect=TAP_EFFECTS.get(skill.key, "mph"),
+                max_level=max_level,
+                prices=[skill.price_for_level(level) for level in levels],
+                profits=[skill.calculate_profit(level) for level in levels],
+                requirements=requirements,
+            )
+        )
+    return tables
+
+
+class Hero:
+    """The attributes BetCounter reads."""
+
+    __slots__ = ("level", "mph", "balance")
+
+    def __init__(self, level: int, mph: float, balance: float) -> None:
+        self.level, self.mph, self.balance = level, mph, balance
+
+
+class Population:
+    """Accounts advanced together in fixed time steps, state kept column-wise in arrays.
+
+    Every account wakes after its BOT_SLEEP_TIME plus the time it spends tapping, collects the
+    mining income, drains the energy with taps and runs the bot's upgrade passes: hero skills by
+    weight, then mining skills, each upgrade only if MONEY_TO_SAVE stays on the balance. Upgrade
+    durations, quests, boxes, PvP results and hero level-ups are not modelled; tap skills add their
+    profit to the tap limit, recovery and money per tap.
+    """
+
+    def __init__(self, skills: list[SkillTable], scenarios: list[dict], start: Start, step: int) -> None:
+        self.skills = skills
+        self.scenarios = scenarios
+        self.start = start
+        self.step = step
+        self.index = {skill.key: number for number, skill in enumerate(skills)}
+        self.settings: list[Settings] = [
+            config.model_copy(update={name: scenario[name] for name in UPGRADE_SETTINGS}) for scenario in scenarios
+        ]
+        count = len(scenarios)
+        self.money = array("d", [start.money]) * count
+        self.mph = array("d", [0]) * count
+        self.energy = array("d", [start.limit]) * count
+        self.limit = array("d", [start.limit]) * count
+        self.recovery = array("d", [start.recovery]) * count
+        self.money_per_tap = array("d", [start.money_per_tap]) * count
+        self.levels = [array("H", [0]) * len(skills) for _ in range(count)]
+        self.last_wake = array("d", [0]) * count
+        self.upgrades = array("l", [0]) * count
+        self.spent = array("d", [0]) * count
+        self.candidates: list[tuple[list[tuple[int, int, int]], ...] | None] = [None] * count
+        self.cheapest = array("d", [0]) * count
+        self.random = [random.Random(scenario["seed"]) for scenario in scenarios]
+
+    def run(self, days: float) -> list[dict]:
+        steps = int(days * 86400 // self.step)
+        wheel: dict[int, list[int]] = {0: list(range(len(self.scenarios)))}
+        for current in range(steps + 1):
+            for account in wheel.pop(current, ()):
+                busy = self.wake(account, current * self.step)
+                delay = self.scenarios[account]["BOT_SLEEP_TIME"] * self.random[account].uniform(0.9, 1.1) + busy
+                wheel.setdefault(current + max(1, round(delay / self.step)), []).append(account)
+        for account in range(len(self.scenarios)):
+            self.collect(account, steps * self.step)
+        return [
+            {
+                "mph": self.mph[account],
+                "money": self.money[account],
+                "upgrades": self.upgrades[account],
+                "spent": self.spent[account],
+            }
+            for account in range(len(self.scenarios))
+        ]
+
+    def collect(self, account: int, now: float) -> None:
+        elapsed = now - self.last_wake[account]
+        self.last_wake[account] = now
+        self.money[account] += self.mph[account] * elapsed / 3600
+        self.energy[account] = min(self.limit[account], self.energy[account] + self.recovery[account] * elapsed)
+
+    def wake(self, account: int, now: float) -> float:
+        self.collect(account, now)
+        busy = self.tap(account)
+        self.upgrade(account)
+        return busy
+
+    def tap(self, account: int) -> float:
+        """Drain the energy like TapPlanner: money earned is twice the energy spent.
+
+        When the recovery keeps up with the taps, TapPlanner spends the energy once and the
+        recovered energy stays.
+        """
+        spend = self.money_per_tap[account] * self.scenarios[account]["TAPS_PER_SECOND"] / 2
+        if self.energy[account] < spend:
+            return 0
+        if (drain := spend - self.recovery[account]) <= 0:
+            seconds = self.energy[account] / spend
+            self.money[account] += self.energy[account] * 2
+            return seconds
+        seconds = self.energy[account] / drain
+        self.money[account] += spend * seconds * 2
+        self.energy[account] = 0
+        return seconds
+
+    def reserve(self, account: int) -> float:
+        money_to_save = self.scenarios[account]["MONEY_TO_SAVE"]
+        if money_to_save == "bet":
+            hero = Hero(self.start.level, self.mph[account], self.money[account])
+            return BetCounter(hero).max_bet()
+        return money_to_save
+
+    def available(self, account: int) -> list[tuple[int, int, float]]:
+        """(skill, next level, weight) of the skills the bot would consider this cycle."""
+        levels = self.levels[account]
+        result = []
+        for number, skill in enumerate(self.skills):
+            next_level = levels[number] + 1
+            if next_level > skill.max_level:
+                continue
+            hero_level, friends, required = skill.requirements[next_level]
+            if hero_level > self.start.level or friends > self.start.friends:
+                continue
+            if required and not any(
+                key in self.index and levels[self.index[key]] >= level for key, level in required.items()
+            ):
+                continue
+            result.append((number, next_level, skill.profits[next_level] / skill.prices[next_level]))
+        return result
+
+    def passes(self, account: int) -> tuple[list[tuple[int, int, int]], list[tuple[int, int, int]]]:
+        """(skill, next level, price) the hero pass and the mining pass would upgrade, in the bot's order."""
+        settings = self.settings[account]
+        available = self.available(account)
+        hero = [
+            (number, next_level, self.skills[number].prices[next_level])
+            for number, next_level, weight in sorted(available, key=lambda item: item[2], reverse=True)
+            if wants_hero_upgrade(self.skills[number].title, weight, settings)
+        ]
+        mining = [
+            (number, next_level, skill.prices[next_level])
+            for number, next_level, _ in available
+            if (skill := self.skills[number]).mining
+            and wants_mining_upgrade(skill.key, next_level, skill.prices[next_level], settings)
+        ]
+        return hero, mining
+
+    def upgrade(self, account: int) -> None:
+        reserve = self.reserve(account)
+        if (passes := self.candidates[account]) is None:
+            passes = self.candidates[account] = self.passes(account)
+            self.cheapest[account] = min((price for upgrades in passes for _, _, price in upgrades), default=1e300)
+        if self.money[account] - reserve < self.cheapest[account]:
+            return
+        hero, mining = passes
+        upgraded = set()
+        for number, next_level, _ in hero:
+            self.buy(account, number, next_level, reserve, upgraded)
+        for number, next_level, _ in mining:
+            if number not in upgraded:
+                self.buy(account, number, next_level, reserve, upgraded)
+
+    def buy(self, account: int, number: int, next_level: int, reserve: float, upgraded: set) -> None:
+        skill = self.skills[number]
+        price = skill.prices[next_level]
+        if self.money[account] - price < reserve:
+            return
+        self.money[account] -= price
+        self.spent[account] += price
+        self.levels[account][number] = next_level
+        self.upgrades[account] += 1
+        upgraded.add(number)
+        self.candidates[account] = None
+        gain = skill.profits[next_level] - skill.profits[next_level - 1]
+        if skill.effect == "limit":
+            self.limit[account] += gain
+        elif skill.effect == "recovery":
+            self.recovery[account] += gain
+        elif skill.effect == "money_per_tap":
+            self.money_per_tap[account] += gain
+        else:
+            self.mph[account] += gain
+
+
+_skills: list[SkillTable] = []
+
+
+def _init_worker(skills: list[SkillTable]) -> None:
+    global _skills
+    _skills = skills
+
+
+def simulate_chunk(scenarios: list[dict], start: Start, step: int, days: float) -> list[dict]:
+    return Population(_skills, scenarios, start, step).run(days)
+
+
+def parse_value(value: str) -> float | str:
+    try:
+        return float(value) if "." in value or "e" in value else int(value)
+    except ValueError:
+        return value
+
+
+def build_grid(overrides: list[str]) -> dict[str, list]:
+    grid = dict(DEFAULT_GRID)
+    for item in overrides:
+        name, _, values = item.partition("=")
+        if name not in DEFAULT_GRID:
+            sys.exit(f"Unknown setting {name}, choose from {', '.join(DEFAULT_GRID)}")
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def summarize(grid: dict[str, list], seeds: int, results: list[dict]) -> list[dict]:
+    rows = []
+    for number, values in enumerate(product(*grid.values())):
+        runs = results[number * seeds : (number + 1) * seeds]
+        mph = [run["mph"] for run in runs]
+        rows.append(
+            {
+                **dict(zip(grid, values)),
+                "mph": statistics.mean(mph),
+                "mph_min": min(mph),
+                "money": statistics.mean(run["money"] for run in runs),
+                "upgrades": statistics.mean(run["upgrades"] for run in runs),
+            }
+        )
+    return sorted(rows, key=lambda row: -row["mph"])
+
+
+def format_cell(name: str, value: float | str) -> str:
+    if name in RESULT_COLUMNS:
+        return f"{value:,.0f}"
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def print_table(rows: list[dict]) -> None:
+    header = list(rows[0])
+    cells = [[format_cell(name, value) for name, value in row.items()] for row in rows]
+    widths = [max(len(cell) for cell in column) for column in zip(header, *cells)]
+    for row in [header, *cells]:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main() -> None:
+    parser = ArgumentParser(description="Compare upgrade and tap settings on simulated accounts")
+    parser.add_argument("--catalog", type=Path, default=FIXTURE, help="dbData or dbSkills JSON")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2", help="Values of one setting")
+    parser.add_argument("--days", type=float, default=30)
+    parser.add_argument("--seeds", type=int, default=5, help="Simulated accounts per scenario")
+    parser.add_argument("--step", type=int, default=60, help="Time step in seconds")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--level-cap", type=int, default=200, help="Highest skill level to precompute")
+    parser.add_argument("--money", type=int, default=0, help="Starting balance")
+    parser.add_argument("--hero-level", type=int, default=1)
+    parser.add_argument("--friends", type=int, default=0)
+    parser.add_argument("--money-per-tap", type=int, default=1)
+    parser.add_argument("--tap-limit", type=int, default=500)
+    parser.add_argument("--tap-recovery", type=int, default=1)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", type=Path, help="Write all scenario results to this file")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    skills = load_catalog(args.catalog, args.level_cap)
+    grid = build_grid(args.grid)
+    scenarios = [
+        {**dict(zip(grid, values)), "seed": number * args.seeds + seed}
+        for number, values in enumerate(product(*grid.values()))
+        for seed in range(args.seeds)
+    ]
+    start = Start(args.money, args.hero_level, args.friends, args.money_per_tap, args.tap_limit, args.tap_recovery)
+    chunk_size = max(1, len(scenarios) // (args.workers * 4))
+    chunks = [scenarios[index : index + chunk_size] for index in range(0, len(scenarios), chunk_size)]
+    with ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(skills,)) as executor:
+        futures = [executor.submit(simulate_chunk, chunk, start, args.step, args.days) for chunk in chunks]
+        results = [run for future in futures for run in future.result()]
+
+    rows = summarize(grid, args.seeds, results)
+    print_table(rows[: args.top])
+    print(
+        f"\n{len(scenarios)} accounts, {len(rows)} scenarios, {args.days:g} days "
+        f"in {time.perf_counter() - started:.1f}s on {args.workers} workers"
+    )
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
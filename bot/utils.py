@@ -1,34 +1,83 @@
 import json
+import sqlite3
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fake_useragent import UserAgent
+if TYPE_CHECKING:
+    from fake_useragent import UserAgent
 
 
-def read_session_profiles(sessions: list[str]) -> dict | None:
-    file_path = Path("session_profile.json")
-    if not file_path.exists():
-        return None
+@cache
+def get_ua_generator() -> "UserAgent":
+    from fake_useragent import UserAgent
 
-    try:
-        with file_path.open(encoding="utf-8") as file:
-            data = json.load(file)
-            return data if all(session in data and len(data[session]) >= 2 for session in sessions) else None
-    except (OSError, json.JSONDecodeError):
-        return None
+    return UserAgent(browsers=["safari"], os=["ios"], platforms=["mobile", "tablet"])
 
 
-def get_session_profiles(sessions: list[str]) -> dict:
-    session_profiles = read_session_profiles(sessions)
-    if session_profiles is None:
-        session_profiles = {}
-        ua_generator = UserAgent(browsers=["safari"], os=["ios"], platforms=["mobile", "tablet"])
+class SessionProfileStore:
+    """Session profiles keyed by session name, profiles are created only for new sessions.
+
+    session_profile.json stays the place to edit profiles: new sessions are exported to it, and
+    when the file is newer than the store its entries are imported and win over the stored ones,
+    so a proxy set there is used on the next start.
+    """
+
+    def __init__(self, path: str = "session_profile.sqlite3", legacy_path: str = "session_profile.json") -> None:
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path)
+        store_mtime = self.path.stat().st_mtime if self.path.exists() else 0
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS profiles (session TEXT PRIMARY KEY, user_agent TEXT NOT NULL, proxy TEXT)"
+        )
+        if self.legacy_path.exists() and self.legacy_path.stat().st_mtime > store_mtime:
+            self._import_legacy()
+
+    def _import_legacy(self) -> None:
+        try:
+            with self.legacy_path.open(encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return
+        rows = []
+        for session, items in data.items():
+            profile = {k: v for item in items for k, v in item.items()}
+            if profile.get("User-Agent"):
+                rows.append((session, profile["User-Agent"], profile.get("proxy")))
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?)", rows)
 
-        for session in sessions:
-            inner = session_profiles.setdefault(session, [])
-            inner.append({"User-Agent": ua_generator.random})
-            inner.append({"proxy": None})
+    def _export_legacy(self, known: dict[str, tuple[str, str | None]]) -> None:
+        data = {
+            session: [{"User-Agent": user_agent}, {"proxy": proxy}] for session, (user_agent, proxy) in known.items()
+        }
+        with self.legacy_path.open("w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=4)
 
-        with Path("session_profile.json").open("w", encoding="utf-8") as file:
-            json.dump(session_profiles, file, ensure_ascii=False, indent=4)
+    def get_profiles(self, sessions: list[str]) -> dict[str, list[dict]]:
+        known = {
+            session: (user_agent, proxy)
+            for session, user_agent, proxy in self._connection.execute(
+                "SELECT session, user_agent, proxy FROM profiles"
+            )
+        }
+        new_rows = [(session, get_ua_generator().random, None) for session in sessions if session not in known]
+        if new_rows:
+            with self._connection:
+                self._connection.executemany("INSERT INTO profiles VALUES (?, ?, ?)", new_rows)
+            known.update({session: (user_agent, proxy) for session, user_agent, proxy in new_rows})
+        if new_rows or not self.legacy_path.exists():
+            self._export_legacy(known)
+        return {session: [{"User-Agent": known[session][0]}, {"proxy": known[session][1]}] for session in sessions}
 
-    return session_profiles
+    def close(self) -> None:
+        self._connection.close()
+
+
+def get_session_profiles(sessions: list[str]) -> dict:
+    store = SessionProfileStore()
+    try:
+        return store.get_profiles(sessions)
+    finally:
+        store.close()
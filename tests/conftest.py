@@ -0,0 +1,33 @@
+import os
+
+# the settings need the Telegram credentials at import, before any test module imports the bot
+os.environ.setdefault("API_ID", "1")
+os.environ.setdefault("API_HASH", "test")
+
+import pytest  # noqa: E402
+
+from bot.core import clock  # noqa: E402
+
+
+class ManualClock(clock.Clock):
+    def __init__(self) -> None:
+        self.now_monotonic = 0.0
+
+    def monotonic(self) -> float:
+        return self.now_monotonic
+
+
+@pytest.fixture
+def manual_clock():
+    manual = ManualClock()
+    clock.use(manual)
+    yield manual
+    clock.use(clock.Clock())
+
+
+@pytest.fixture
+def fast_clock():
+    fast = clock.FastForwardClock()
+    clock.use(fast)
+    yield fast
+    clock.use(clock.Clock())
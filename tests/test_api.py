@@ -0,0 +1,52 @@
+import asyncio
+from types import SimpleNamespace
+
+from bot.config.settings import config
+from bot.core import clock
+from bot.core.bot import CryptoBot
+from bot.core.metrics import cycle_metrics
+
+
+def claim_response(money: int) -> dict:
+    task = {"moneyPerTap": 1, "limit": 1000, "energy": 500, "recoveryPerSecond": 1}
+    return {"data": {"hero": {"money": money, "level": 1, "moneyPerHour": 3600, "earns": {"task": task}}}}
+
+
+def test_batch_balance_comes_from_the_latest_hero():
+    bot = CryptoBot(tg_client=SimpleNamespace(name="test"), additional_data=[{"User-Agent": "test"}])
+    bot._update_money_balance_once([claim_response(3000), claim_response(1000), claim_response(2000)])
+    assert bot.balance == 3000
+
+
+def test_box_loot_of_an_unknown_shape_is_logged_as_it_came(monkeypatch):
+    bot = CryptoBot(tg_client=SimpleNamespace(name="test"), additional_data=[{"User-Agent": "test"}])
+    responses = iter([{"loot": [{"type": "money", "value": 1000}]}, {"loot": {"money": 500}}])
+
+    async def get_box_list() -> dict:
+        return {"box_small": 2}
+
+    async def box_open(json_body: dict) -> dict:
+        return next(responses)
+
+    monkeypatch.setattr(config, "BULK_DELAY", [0, 0])
+    monkeypatch.setattr(config, "JOURNAL_ENABLED", False)
+    monkeypatch.setattr(bot, "get_box_list", get_box_list)
+    monkeypatch.setattr(bot, "box_open", box_open)
+    messages = []
+    monkeypatch.setattr(bot, "logger", SimpleNamespace(info=messages.append, warning=messages.append))
+    asyncio.run(bot.get_box_rewards())
+    assert messages == ["Boxes opened: <g>2/2</g> | Loot: <y>money +1.0k | Other: [{'money': 500}]</y>"]
+
+
+def test_stage_counts_only_the_waits_of_its_own_task():
+    bot = CryptoBot(tg_client=SimpleNamespace(name="test"), additional_data=[{"User-Agent": "test"}])
+
+    async def run() -> None:
+        async with bot.stage("test"):
+            await clock.sleep(0.05)
+            await asyncio.gather(*(clock.sleep(0.05) for _ in range(5)))
+
+    asyncio.run(run())
+    active, slept, _ = cycle_metrics.samples["test"][-1]
+    assert 0.05 <= slept < 0.09
+    assert active >= 0.04
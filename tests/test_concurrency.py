@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+from pyrogram.errors import FloodWait
+
+from bot.config.settings import config
+from bot.core.concurrency import TelegramCoordinator
+
+
+async def flood() -> None:
+    raise FloodWait(value=600)
+
+
+async def succeed() -> None:
+    pass
+
+
+def test_flood_wait_holds_back_only_the_flooded_account(fast_clock, monkeypatch):
+    monkeypatch.setattr(config, "TG_FLOOD_GROUP_THRESHOLD", 2)
+    coordinator = TelegramCoordinator()
+
+    async def run() -> float:
+        with pytest.raises(FloodWait):
+            await coordinator.call("flooded", "proxy", flood)
+        await coordinator.call("other", "other proxy", succeed)
+        return fast_clock.monotonic()
+
+    assert asyncio.run(run()) < 1
+    assert coordinator.account_interval("flooded") == config.TG_ACCOUNT_CALL_INTERVAL * 2
+    assert coordinator.account_interval("other") == config.TG_ACCOUNT_CALL_INTERVAL
+
+
+def test_backoff_shrinks_back_while_calls_succeed(fast_clock):
+    coordinator = TelegramCoordinator()
+    coordinator.observe_flood("flooded", None, 1)
+
+    async def run() -> None:
+        for _ in range(20):
+            await coordinator.call("flooded", None, succeed)
+
+    asyncio.run(run())
+    assert coordinator.account_interval("flooded") == config.TG_ACCOUNT_CALL_INTERVAL
+
+
+def test_sessions_without_proxy_do_not_share_a_proxy_group(fast_clock, monkeypatch):
+    monkeypatch.setattr(config, "TG_FLOOD_GROUP_THRESHOLD", 2)
+    coordinator = TelegramCoordinator()
+
+    async def run() -> float:
+        for session in ("first", "second"):
+            with pytest.raises(FloodWait):
+                await coordinator.call(session, None, flood)
+        for session in ("third", "fourth"):
+            await coordinator.wait_ready(session, None)
+            await coordinator.call(session, None, succeed)
+        return fast_clock.monotonic()
+
+    assert asyncio.run(run()) == 0
@@ -0,0 +1,10 @@
+import os
+
+import pytest
+
+from bot.tools.importtime import BUDGETS, check
+
+
+@pytest.mark.parametrize("budget", BUDGETS, ids=lambda budget: budget.module)
+def test_import_budget(budget):
+    assert check(budget, float(os.environ.get("IMPORT_BUDGET_SCALE", 1)), top=0) == []
@@ -0,0 +1,17 @@
+from bot.core.quests import QuestIndex
+
+
+def make_index(codes: dict) -> QuestIndex:
+    return QuestIndex(quests=[], codes=codes)
+
+
+def test_normalised_title_matches():
+    index = make_index({"How cloud storage works?": 111})
+    assert index.code_for("how  CLOUD storage works") == 111
+    assert index.code_for("How сloud storage works?") == 111
+
+
+def test_close_match_needs_the_same_numbers():
+    index = make_index({"Episode 13: Crypto": 1313})
+    assert index.code_for("Episode 14: Crypto") is None
+    assert index.code_for("Episode 13: Cripto") == 1313
@@ -0,0 +1,35 @@
+import asyncio
+
+import aiohttp
+
+from bot.core.reference_cache import ReferenceCache
+
+URL = "https://example.invalid/helper.json"
+
+
+class UnreachableClient:
+    def __init__(self) -> None:
+        self.requests = 0
+
+    def get(self, url: str, headers: dict):
+        self.requests += 1
+        raise aiohttp.ClientConnectionError("unreachable")
+
+
+def test_saved_copy_is_retried_after_a_short_delay(manual_clock, tmp_path):
+    cache = ReferenceCache(str(tmp_path))
+    cache._write(URL, '{"saved": true}', {"ETag": '"1"'})
+    client = UnreachableClient()
+    observed = []
+
+    async def fetch() -> str:
+        return await cache.fetch(client, URL, max_age=7200, observe=lambda elapsed, ok: observed.append(ok))
+
+    assert asyncio.run(fetch()) == '{"saved": true}'
+    manual_clock.now_monotonic = cache.retry_after - 1
+    asyncio.run(fetch())
+    assert client.requests == 1
+    manual_clock.now_monotonic = cache.retry_after + 1
+    asyncio.run(fetch())
+    assert client.requests == 2
+    assert observed == [False, False]
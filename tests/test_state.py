@@ -0,0 +1,28 @@
+from bot.config.settings import config
+from bot.core.state import HeroState
+
+
+def hero(money: int, money_per_hour: int = 3600) -> dict:
+    task = {"moneyPerTap": 1, "limit": 1000, "energy": 500, "recoveryPerSecond": 1}
+    return {"money": money, "level": 1, "moneyPerHour": money_per_hour, "earns": {"task": task}}
+
+
+def test_other_responses_do_not_reset_the_sync_age(manual_clock):
+    state = HeroState()
+    state.reconcile(hero(1000), authoritative=True)
+    manual_clock.now_monotonic = config.BALANCE_SYNC_MAX_AGE + 1
+    state.reconcile(hero(500))
+    assert state.needs_sync()
+    assert state.projected_money() == 500
+
+
+def test_drift_is_measured_on_authoritative_snapshots(manual_clock):
+    state = HeroState()
+    state.reconcile(hero(1000), authoritative=True)
+    manual_clock.now_monotonic = 100
+    state.reconcile(hero(1100), authoritative=True)
+    assert not state.needs_sync()
+    manual_clock.now_monotonic = 200
+    state.reconcile(hero(5000), authoritative=True)
+    assert state.drift > config.BALANCE_SYNC_TOLERANCE
+    assert state.needs_sync()
@@ -0,0 +1,34 @@
+from bot.config.settings import config
+from bot.core.models import Profile
+from bot.core.taps import TapPlanner
+
+
+def make_profile(energy: int, recovery: int, money_per_tap: int = 2, limit: int = 5000) -> Profile:
+    task = {"moneyPerTap": money_per_tap, "limit": limit, "energy": energy, "recoveryPerSecond": recovery}
+    return Profile(hero={"earns": {"task": task}, "money": 0, "level": 1, "moneyPerHour": 0})
+
+
+def run_planner(profile: Profile, max_batches: int = 1000) -> list:
+    planner = TapPlanner(profile)
+    energy, batches = profile.energy, []
+    while (batch := planner.next_batch(energy)) and len(batches) < max_batches:
+        batches.append(batch)
+        energy = batch.energy
+    return batches
+
+
+def test_drains_energy_in_few_requests(monkeypatch):
+    monkeypatch.setattr(config, "TAPS_PER_SECOND", [20, 20])
+    batches = run_planner(make_profile(energy=5000, recovery=3))
+    assert 1 <= len(batches) < 20
+    assert batches[-1].energy < 20
+
+
+def test_stops_when_recovery_keeps_up_with_taps(monkeypatch):
+    monkeypatch.setattr(config, "TAPS_PER_SECOND", [20, 20])
+    # 20 taps * 2 money / 2 = 20 energy spent per second, fully recovered every second
+    profile = make_profile(energy=5000, recovery=20)
+    batches = run_planner(profile)
+    assert batches
+    assert len(batches) < 1000
+    assert batches[-1].energy == profile.limit
@@ -0,0 +1,25 @@
+from bot.config.settings import config
+from bot.core.upgrades import wants_hero_upgrade, wants_mining_upgrade
+
+
+def test_hero_upgrade_needs_the_weight_and_no_skip():
+    settings = config.model_copy(update={"SKILL_WEIGHT": 0.01, "SKIP_TO_UPGRADE_SKILLS": ["Skipped"]})
+    assert wants_hero_upgrade("Skill", 0.02, settings)
+    assert not wants_hero_upgrade("Skill", 0.005, settings)
+    assert not wants_hero_upgrade("Skipped", 0.02, settings)
+    assert not wants_hero_upgrade("Skill", 0, config.model_copy(update={"SKILL_WEIGHT": 0}))
+
+
+def test_mining_upgrade_limits():
+    settings = config.model_copy(
+        update={
+            "MAX_MINING_UPGRADE_LEVEL": 10,
+            "MAX_MINING_UPGRADE_COSTS": 1000,
+            "MAX_MINING_ENERGY_RECOVERY_UPGRADE_LEVEL": 30,
+        }
+    )
+    assert wants_mining_upgrade("desks", 10, 5000, settings)
+    assert wants_mining_upgrade("desks", 20, 500, settings)
+    assert not wants_mining_upgrade("desks", 20, 5000, settings)
+    assert wants_mining_upgrade("energy_recovery", 20, 5000, settings)
+    assert not wants_mining_upgrade("energy_recovery", 40, 5000, settings)